@@ -27,6 +27,10 @@ SERIAL_DEVICE = os.environ.get("SERIAL_DEVICE", None)  # e.g., "/dev/ttyUSB0" on
 # --- Database configuration ---
 DATABASE_PATH = os.environ.get("DATABASE_PATH", "nodedb.sqlite")
 
+# Pre-built gzip CSV of the default node export, refreshed in the background
+NODES_EXPORT_CACHE_PATH = os.environ.get("NODES_EXPORT_CACHE_PATH", "nodes_export.csv.gz")
+NODES_EXPORT_REFRESH_SECONDS = 60
+
 # --- Discord webhook ---
 DISCORD_WEBHOOK_URL = os.environ.get("DISCORD_WEBHOOK_URL", "")
 
@@ -2,9 +2,45 @@
 
 import sqlite3
 import time
+import queue
 import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from config import DATABASE_PATH
 
+# Read connections reused by the web routes instead of reconnecting per request
+CONNECTION_POOL_SIZE = 8
+connection_pool = queue.Queue(maxsize=CONNECTION_POOL_SIZE)
+
+# Set by init_database() once the nodes_fts search index is in place
+nodes_fts_available = False
+
+
+def open_pooled_connection():
+    """Open a connection tuned for repeated reads from the web interface"""
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-20000')
+    conn.execute('PRAGMA mmap_size=268435456')
+    return conn
+
+
+@contextmanager
+def get_connection():
+    """Borrow a pooled connection, returning it to the pool when done"""
+    try:
+        conn = connection_pool.get_nowait()
+    except queue.Empty:
+        conn = open_pooled_connection()
+    try:
+        yield conn
+    finally:
+        try:
+            conn.rollback()
+            connection_pool.put_nowait(conn)
+        except (sqlite3.Error, queue.Full):
+            conn.close()
+
 
 def init_database():
     """Initialize the SQLite database for nodedb storage"""
@@ -12,6 +48,9 @@ def init_database():
         conn = sqlite3.connect(DATABASE_PATH)
         cursor = conn.cursor()
         
+        # WAL lets the web interface read while the bot is writing node updates
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Create nodes table to store node information
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS nodes (
@@ -39,15 +78,19 @@ def init_database():
             )
         ''')
         
-        # Create an index on last_heard for efficient queries
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_nodes_last_heard ON nodes(last_heard)
-        ''')
+        # Index each sortable column together with node_id, the node browser's
+        # tiebreak, so ORDER BY ... LIMIT and page cursors walk the index
+        # instead of sorting the table. These replace the older single-column
+        # indexes, which also covered the last_heard/updated_at lookups.
+        for column in ('last_heard', 'updated_at', 'long_name', 'short_name', 'rssi', 'snr', 'hop_count'):
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_nodes_{column}_node_id ON nodes({column}, node_id)')
+            cursor.execute(f'DROP INDEX IF EXISTS idx_nodes_{column}')
         
-        # Create an index on updated_at for efficient queries
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_nodes_updated_at ON nodes(updated_at)
-        ''')
+        # Full-text index over the searchable columns, kept in sync by triggers
+        init_nodes_fts(cursor)
+        
+        # Write counter that moves on every nodes change, for page and export caching
+        init_nodes_version(cursor)
         
         # Add new columns if they don't exist (for existing databases)
         try:
@@ -80,6 +123,97 @@ def init_database():
         return False
 
 
+def init_nodes_fts(cursor):
+    """Create the nodes_fts search index, falling back to LIKE if FTS5 is missing"""
+    global nodes_fts_available
+    try:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'nodes_fts'")
+        created = cursor.fetchone() is None
+        
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS nodes_fts USING fts5(
+                node_id, long_name, short_name, content='nodes', content_rowid='rowid'
+            )
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS nodes_fts_insert AFTER INSERT ON nodes BEGIN
+                INSERT INTO nodes_fts(rowid, node_id, long_name, short_name)
+                VALUES (new.rowid, new.node_id, new.long_name, new.short_name);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS nodes_fts_delete AFTER DELETE ON nodes BEGIN
+                INSERT INTO nodes_fts(nodes_fts, rowid, node_id, long_name, short_name)
+                VALUES ('delete', old.rowid, old.node_id, old.long_name, old.short_name);
+            END
+        ''')
+        # Only name changes touch the index, not the frequent metric updates
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS nodes_fts_update
+            AFTER UPDATE OF node_id, long_name, short_name ON nodes BEGIN
+                INSERT INTO nodes_fts(nodes_fts, rowid, node_id, long_name, short_name)
+                VALUES ('delete', old.rowid, old.node_id, old.long_name, old.short_name);
+                INSERT INTO nodes_fts(rowid, node_id, long_name, short_name)
+                VALUES (new.rowid, new.node_id, new.long_name, new.short_name);
+            END
+        ''')
+        
+        # Index nodes stored before the search table existed
+        if created:
+            cursor.execute("INSERT INTO nodes_fts(nodes_fts) VALUES ('rebuild')")
+        
+        nodes_fts_available = True
+    except sqlite3.OperationalError as e:
+        print(f"[Database] Full-text search unavailable, using LIKE: {e}")
+        nodes_fts_available = False
+
+
+def init_nodes_version(cursor):
+    """Create the nodes_version write counter and the triggers that bump it"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS nodes_version (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO nodes_version (id, version) VALUES (0, 0)")
+    for event in ('insert', 'update', 'delete'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS nodes_version_{event} AFTER {event.upper()} ON nodes BEGIN
+                UPDATE nodes_version SET version = version + 1 WHERE id = 0;
+            END
+        ''')
+
+
+def node_search_clause(search):
+    """Build the WHERE clause and parameters for a node browser search"""
+    if not search:
+        return "", []
+    
+    if nodes_fts_available:
+        # Quoted phrase with a trailing * does a prefix match on each token
+        match = '"' + search.replace('"', '""') + '"*'
+        return " WHERE rowid IN (SELECT rowid FROM nodes_fts WHERE nodes_fts MATCH ?)", [match]
+    
+    search_param = f"%{search}%"
+    return (" WHERE (node_id LIKE ? OR long_name LIKE ? OR short_name LIKE ?)",
+            [search_param, search_param, search_param])
+
+
+def get_nodes_version():
+    """Return the nodes table's write counter, which changes whenever nodes are added, updated or removed"""
+    with get_connection() as conn:
+        return conn.execute('SELECT version FROM nodes_version WHERE id = 0').fetchone()[0]
+
+
+@lru_cache(maxsize=128)
+def count_nodes(search, nodes_version):
+    """Count nodes matching a node browser search, cached until nodes_version changes"""
+    where_clause, params = node_search_clause(search)
+    with get_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM nodes{where_clause}", params).fetchone()[0]
+
+
 def get_node_name(node_id):
     """Get the display name for a node (long name preferred, fallback to short name, then node ID)"""
     try:
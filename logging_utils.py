@@ -1,6 +1,6 @@
 """Logging utilities for Meshtastic PingBot."""
 
-import datetime
+import time
 import requests
 from config import (
     RESET, BOLD, CYAN, GREEN, YELLOW, RED, MAGENTA, BLUE, WHITE,
@@ -11,10 +11,34 @@ from config import (
 local_radio_name = ""
 socketio = None
 
+# (epoch second, formatted string) so bursts of logs format the time once
+timestamp_cache = (None, "")
+time_of_day_cache = (None, "")
+
 
 def timestamp():
     """Generate a timestamp string."""
-    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global timestamp_cache
+    now = int(time.time())
+    second, formatted = timestamp_cache
+    if now != second:
+        t = time.localtime(now)
+        formatted = (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+                     f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}")
+        timestamp_cache = (now, formatted)
+    return formatted
+
+
+def time_of_day():
+    """Generate an HH:MM:SS time string."""
+    global time_of_day_cache
+    now = int(time.time())
+    second, formatted = time_of_day_cache
+    if now != second:
+        t = time.localtime(now)
+        formatted = f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        time_of_day_cache = (now, formatted)
+    return formatted
 
 
 def send_discord(msg: str):
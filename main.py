@@ -8,7 +8,6 @@ and maintains a SQLite database of node information.
 """
 
 import sys
-import datetime
 from flask import Flask
 from flask_socketio import SocketIO
 
@@ -21,17 +20,7 @@ from meshtastic_handler import (
     connect_radio, setup_exception_handlers, stop_connection,
     get_connection_status
 )
-from web_routes import setup_routes
-
-
-def format_timestamp(timestamp):
-    """Format Unix timestamp for display"""
-    if not timestamp:
-        return 'Never'
-    try:
-        return datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-    except:
-        return 'Invalid'
+from web_routes import setup_routes, schedule_export_cache_refresh
 
 
 def main():
@@ -40,11 +29,6 @@ def main():
     app = Flask(__name__)
     socketio = SocketIO(app, async_mode="threading")
     
-    # Setup template filters
-    @app.template_filter('formatTimestamp')
-    def format_timestamp_filter(timestamp):
-        return format_timestamp(timestamp)
-    
     # Initialize logging with SocketIO instance
     set_socketio(socketio)
     
@@ -79,6 +63,9 @@ def main():
         # Start traceroute worker
         start_traceroute_worker()
         
+        # Keep the default CSV export pre-built
+        schedule_export_cache_refresh()
+        
         # Connect to radio and start monitoring
         interface = connect_radio()
         
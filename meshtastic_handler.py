@@ -3,16 +3,20 @@
 import meshtastic
 import meshtastic.tcp_interface
 import meshtastic.serial_interface
-import datetime
+import random
+import re
 import time
 import threading
 import sys
+from meshtastic import mesh_pb2
 from pubsub import pub
 from config import CONNECTION_TYPE, DEVICE_IP, SERIAL_DEVICE, REPLY_COOLDOWN, TRIGGERS, DM_COMMANDS
-from database import update_node_info, get_node_name
-from logging_utils import log_console_and_web, log_console_web_and_discord, log_web, timestamp, set_local_radio_name
-from traceroute import (split_message, send_messages_async, queue_traceroute, 
-                       pending_traceroutes)
+from database import (update_node_info, get_node_name, get_node_name_by_num,
+                      cleanup_old_nodes, enhanced_download_nodedb,
+                      schedule_periodic_nodedb_refresh)
+from logging_utils import log_console_and_web, log_console_web_and_discord, timestamp, time_of_day, set_local_radio_name
+from traceroute import (split_message, send_messages_async, send_single_async,
+                        queue_traceroute, pending_traceroutes, pop_pending_traceroute)
 
 # Connection and health tracking globals
 is_connected = False
@@ -25,12 +29,55 @@ connection_lock = threading.Lock()
 reconnect_thread = None
 shutdown_event = threading.Event()
 
-# Track socket errors to detect heartbeat failures
-socket_error_count = 0
-socket_error_lock = threading.Lock()
+# Set when a socket error marks the connection failed, waking monitor_connection
+# to reconnect; cleared on reconnect
+socket_error_flag = threading.Event()
+
+# Set while a radio connection is established, so callers can wait on it
+connected_event = threading.Event()
 
 # Rate limiting
 last_reply_time = {}
+REPLY_TIME_SWEEP_EVERY = 1024  # replies between sweeps of expired entries
+replies_since_sweep = 0
+
+# Node database write throttling for packets that only refresh signal metadata
+NODE_UPDATE_MIN_INTERVAL = 30  # seconds between metadata-only updates per node
+NODE_UPDATE_SWEEP_EVERY = 1024  # updates between sweeps of expired entries
+last_node_update = {}
+node_updates_since_sweep = 0
+
+# Command matching
+TRIGGER_SET = frozenset(TRIGGERS)
+DM_COMMAND_SET = frozenset(DM_COMMANDS)
+# "ping N" with N in 1-5; any other second word still counts as a single ping
+PING_COUNT_RE = re.compile(r"ping\s+(?:([1-5])|\S+)")
+
+# Port numbers resolved once at import. Decoded packets carry the portnum as
+# its enum name (the library builds them with MessageToDict), so compare names.
+PORTNUM_NODEINFO = meshtastic.portnums_pb2.PortNum.Name(meshtastic.portnums_pb2.NODEINFO_APP)
+PORTNUM_NEIGHBORINFO = meshtastic.portnums_pb2.PortNum.Name(meshtastic.portnums_pb2.NEIGHBORINFO_APP)
+PORTNUM_TELEMETRY = meshtastic.portnums_pb2.PortNum.Name(meshtastic.portnums_pb2.TELEMETRY_APP)
+PORTNUM_POSITION = meshtastic.portnums_pb2.PortNum.Name(meshtastic.portnums_pb2.POSITION_APP)
+PORTNUM_TRACEROUTE = meshtastic.portnums_pb2.PortNum.Name(meshtastic.portnums_pb2.TRACEROUTE_APP)
+
+# Broadcast destination in each form toId can take
+BROADCAST_DESTINATIONS = frozenset({
+    meshtastic.BROADCAST_ADDR,
+    meshtastic.BROADCAST_NUM,
+    str(meshtastic.BROADCAST_NUM),
+})
+
+# Housekeeping packet types that get a log line when they update the node database
+NODE_UPDATE_LABELS = {
+    PORTNUM_NODEINFO: "node info",
+    PORTNUM_NEIGHBORINFO: "neighbor info",
+    PORTNUM_TELEMETRY: "telemetry",
+    PORTNUM_POSITION: "position",
+}
+
+# SNR value the firmware reports for hops where it is unknown
+UNK_SNR = -128
 
 
 def get_connection_status():
@@ -38,6 +85,11 @@ def get_connection_status():
     return is_connected, message_queue_count
 
 
+def get_interface():
+    """Get the active Meshtastic interface, or None if not connected."""
+    return interface
+
+
 def update_message_queue_count(delta):
     """Update the message queue count safely."""
     global message_queue_count
@@ -82,16 +134,14 @@ def get_local_radio_name(interface):
 
 def extract_rssi_snr(packet):
     """Extract RSSI and SNR from packet."""
-    rssi = None
-    snr = None
-    if "rxMetadata" in packet and packet["rxMetadata"]:
-        rssi = packet["rxMetadata"][0].get("rssi")
-        snr = packet["rxMetadata"][0].get("snr")
-    if rssi is None and "rxRssi" in packet:
-        rssi = packet["rxRssi"]
-    if snr is None and "rxSnr" in packet:
-        snr = packet["rxSnr"]
-    return rssi if rssi is not None else "N/A", snr if snr is not None else "N/A"
+    metadata = packet.get("rxMetadata")
+    first = metadata[0] if metadata else {}
+    # Compare against None rather than relying on truthiness: 0 dB SNR is a real reading
+    if (rssi := first.get("rssi")) is None and (rssi := packet.get("rxRssi")) is None:
+        rssi = "N/A"
+    if (snr := first.get("snr")) is None and (snr := packet.get("rxSnr")) is None:
+        snr = "N/A"
+    return rssi, snr
 
 
 def get_sender_name(packet):
@@ -115,46 +165,101 @@ def get_sender_name(packet):
     return sender_id
 
 
-def get_message_origin(packet):
-    """Determine if message is from channel or direct message"""
-    to_id = packet.get("toId", "")
-    
-    # Check if it's a broadcast/channel message
-    if (to_id == meshtastic.BROADCAST_ADDR or 
-        to_id == meshtastic.BROADCAST_NUM or
-        str(to_id) == str(meshtastic.BROADCAST_NUM)):
-        return "Channel"
-    else:
-        return "DM"
+def update_node_metadata(sender_id, packet):
+    """Update a node from a packet carrying only signal metadata, at most once per interval"""
+    global node_updates_since_sweep
+    now = time.monotonic()
+    last = last_node_update.get(sender_id)
+    if last is not None and now - last < NODE_UPDATE_MIN_INTERVAL:
+        return
+    last_node_update[sender_id] = now
+    update_node_info(sender_id, packet_info=packet)
+    node_updates_since_sweep += 1
+    if node_updates_since_sweep >= NODE_UPDATE_SWEEP_EVERY:
+        node_updates_since_sweep = 0
+        for node_id, updated in list(last_node_update.items()):
+            if now - updated >= NODE_UPDATE_MIN_INTERVAL:
+                del last_node_update[node_id]
+
+
+def record_reply_time(sender_id, now):
+    """Record a reply to sender_id, periodically dropping expired cooldown entries"""
+    global replies_since_sweep
+    last_reply_time[sender_id] = now
+    replies_since_sweep += 1
+    if replies_since_sweep >= REPLY_TIME_SWEEP_EVERY:
+        replies_since_sweep = 0
+        # Entries past the cooldown can no longer rate-limit anyone
+        for node_id, last in list(last_reply_time.items()):
+            if now - last >= REPLY_COOLDOWN:
+                del last_reply_time[node_id]
+
+
+# Help/about replies only depend on config, so build and split them once
+HELP_TEXT = (
+    f"Meshtastic Pingbot Help:\n\n"
+    f"Basic triggers (channels and DMs): {', '.join(TRIGGERS)}\n\n"
+
+    f"Commands:\n"
+    f"• ping/hello/test - Connection info (RSSI, SNR, hop count)\n"
+    f"• ping N - Send N responses (N=1-5)\n"
+    f"• traceroute - Network path trace with hop details\n"
+    f"  (30s rate limit, max 2 queued per user)\n\n"
+
+    f"DM-only commands: help, /help - Show this help message. "
+    f"about, /about - Show information about this bot."
+)
+
+ABOUT_TEXT = (
+    f"Meshtastic Pingbot v1.0\n\n"
+    f"I'm a simple ping-pong bot that helps test Meshtastic network connectivity. "
+    f"Send me '{', '.join(TRIGGERS)}' and I'll respond with your connection quality metrics. "
+    f"Use 'ping N' (N=1-5) for multiple responses. "
+    f"Features: RSSI and SNR reporting, Hop count tracking, Rate limiting (15s cooldown), "
+    f"Channel and DM support. Built for the Meshtastic mesh networking community."
+)
+
+HELP_MESSAGES = tuple(split_message(HELP_TEXT))
+ABOUT_MESSAGES = tuple(split_message(ABOUT_TEXT))
 
 
 def get_help_response():
     """Generate help response for DM help commands (optimized for message splitting)"""
-    return (
-        f"Meshtastic Pingbot Help:\n\n"
-        f"Basic triggers (channels and DMs): {', '.join(TRIGGERS)}\n\n"
-
-        f"Commands:\n"
-        f"• ping/hello/test - Connection info (RSSI, SNR, hop count)\n"
-        f"• ping N - Send N responses (N=1-5)\n"
-        f"• traceroute - Network path trace with hop details\n"
-        f"  (30s rate limit, max 2 queued per user)\n\n"
-
-        f"DM-only commands: help, /help - Show this help message. "
-        f"about, /about - Show information about this bot."
-    )
+    return HELP_TEXT
 
 
 def get_about_response():
     """Generate about response for DM about commands (optimized for message splitting)"""
-    return (
-        f"Meshtastic Pingbot v1.0\n\n"
-        f"I'm a simple ping-pong bot that helps test Meshtastic network connectivity. "
-        f"Send me '{', '.join(TRIGGERS)}' and I'll respond with your connection quality metrics. "
-        f"Use 'ping N' (N=1-5) for multiple responses. "
-        f"Features: RSSI and SNR reporting, Hop count tracking, Rate limiting (15s cooldown), "
-        f"Channel and DM support. Built for the Meshtastic mesh networking community."
-    )
+    return ABOUT_TEXT
+
+
+def classify_command(msg, is_dm):
+    """
+    Classify a normalized (stripped, lowercased) message as a bot command.
+    
+    Kept free of packet, interface and I/O access so the per-message
+    decision can be reasoned about and exercised on its own.
+    
+    Args:
+        msg: Normalized message text
+        is_dm: True if the message was sent directly to the bot
+    
+    Returns:
+        tuple: (command, ping_count)
+            command is "help", "about", "traceroute", "ping" or None
+            ping_count is the number of pongs to send for "ping"
+    """
+    if is_dm and msg in DM_COMMAND_SET:
+        return ("help" if msg in ("help", "/help") else "about"), 1
+    if msg == "traceroute":
+        return "traceroute", 1
+    if msg in TRIGGER_SET:
+        return "ping", 1
+    # "ping N" format; defaults to 1 if N is out of range or not a number
+    ping_match = PING_COUNT_RE.fullmatch(msg)
+    if ping_match:
+        return "ping", int(ping_match.group(1) or 1)
+    return None, 0
 
 
 def handle_traceroute_response_packet(packet, interface):
@@ -166,31 +271,24 @@ def handle_traceroute_response_packet(packet, interface):
         log_console_and_web(f"Received potential traceroute response from {from_id}", "cyan")
         
         # Check if this is a response to any of our pending traceroutes
-        # We need to match based on the destination we sent to, not the sender
+        # We need to match based on the destination we sent to, not the sender,
+        # and claiming it removes it from the pending requests
         matching_request = None
-        matching_sender_id = None
-        
         for sender_id, pending_request in list(pending_traceroutes.items()):
-            # The target_id in the request is where we sent the traceroute to
-            # and from_id should match that
-            target_node_id = pending_request.get('target_node_id')
-            if target_node_id and target_node_id == from_id:
-                matching_request = pending_request
-                matching_sender_id = sender_id
-                log_console_and_web(f"Matched traceroute response from {from_id} to pending request for {pending_request['sender_name']}", "green")
+            if pending_request.get('target_node_id') == from_id:
+                matching_request = pop_pending_traceroute(sender_id)
                 break
         
         if not matching_request:
             # Not a response to our traceroute request
             log_console_and_web(f"No matching traceroute request for response from {from_id}", "yellow")
             return
-            
+        
+        log_console_and_web(f"Matched traceroute response from {from_id} to pending request for {matching_request['sender_name']}", "green")
+        
         destination_id = matching_request['destination_id']
         sender_name = matching_request['sender_name']
         
-        # Remove from pending requests
-        del pending_traceroutes[matching_sender_id]
-        
         # Extract information from the packet
         decoded = packet.get("decoded", {})
         packet_type = decoded.get("portnum")
@@ -202,37 +300,30 @@ def handle_traceroute_response_packet(packet, interface):
         result_lines.append(f"Traceroute to {sender_name}:")
         
         # Parse RouteDiscovery payload for TRACEROUTE_APP packets
-        if packet_type == meshtastic.portnums_pb2.TRACEROUTE_APP:
+        if packet_type == PORTNUM_TRACEROUTE:
             try:
-                from meshtastic import mesh_pb2
-                import google.protobuf.json_format
-                
                 payload = decoded.get("payload", b"")
                 if payload:
+                    # Read the repeated fields straight off the protobuf rather
+                    # than converting the whole message with MessageToDict
                     route_discovery = mesh_pb2.RouteDiscovery()
                     route_discovery.ParseFromString(payload)
-                    route_dict = google.protobuf.json_format.MessageToDict(route_discovery)
-                    
-                    log_console_and_web(f"Parsed RouteDiscovery data: {len(route_dict.get('route', []))} hops", "cyan")
                     
                     # Format the route towards destination
-                    route_list = route_dict.get("route", [])
-                    snr_towards = route_dict.get("snrTowards", [])
+                    route_list = route_discovery.route
+                    snr_towards = route_discovery.snr_towards
+                    
+                    log_console_and_web(f"Parsed RouteDiscovery data: {len(route_list)} hops", "cyan")
                     
                     if route_list or snr_towards:
                         result_lines.append("\nRoute traced:")
                         
-                        # Build route string with node IDs
-                        route_str_parts = []
-                        
-                        # Start with us (the bot)
-                        route_str_parts.append("Bot")
+                        # Build route string with node IDs, starting with us (the bot)
+                        route_str_parts = ["Bot"]
                         
                         # Add intermediate hops
-                        UNK_SNR = -128
                         for idx, node_num in enumerate(route_list):
                             # Try to get node name from database
-                            from database import get_node_name_by_num
                             node_name = None
                             try:
                                 node_name = get_node_name_by_num(node_num)
@@ -251,15 +342,11 @@ def handle_traceroute_response_packet(packet, interface):
                             route_str_parts.append(f"{node_name}{snr_str}")
                         
                         # End with destination
-                        if snr_towards:
-                            last_snr_idx = len(snr_towards) - 1
-                            if last_snr_idx >= 0 and snr_towards[last_snr_idx] != UNK_SNR:
-                                snr_val = snr_towards[last_snr_idx] / 4.0
-                                result_lines.append(" -> ".join(route_str_parts) + f" -> {sender_name} ({snr_val:.1f}dB)")
-                            else:
-                                result_lines.append(" -> ".join(route_str_parts) + f" -> {sender_name}")
+                        if snr_towards and snr_towards[-1] != UNK_SNR:
+                            route_str_parts.append(f"{sender_name} ({snr_towards[-1] / 4.0:.1f}dB)")
                         else:
-                            result_lines.append(" -> ".join(route_str_parts) + f" -> {sender_name}")
+                            route_str_parts.append(sender_name)
+                        result_lines.append(" -> ".join(route_str_parts))
                         
                         # Add hop count
                         hop_count = len(route_list)
@@ -269,14 +356,13 @@ def handle_traceroute_response_packet(packet, interface):
                             result_lines.append(f"Total hops: {hop_count}")
                         
                         # Check for return route
-                        route_back = route_dict.get("routeBack", [])
-                        snr_back = route_dict.get("snrBack", [])
+                        route_back = route_discovery.route_back
+                        snr_back = route_discovery.snr_back
                         if route_back or snr_back:
                             result_lines.append("\nReturn route:")
                             back_parts = [sender_name]
                             
                             for idx, node_num in enumerate(route_back):
-                                from database import get_node_name_by_num
                                 node_name = None
                                 try:
                                     node_name = get_node_name_by_num(node_num)
@@ -305,33 +391,24 @@ def handle_traceroute_response_packet(packet, interface):
                 log_console_and_web(f"Error parsing traceroute data for {sender_name}: {parse_error}", "red")
                 result_lines.append("Traceroute completed (parse error)")
         
-        # Add basic packet info for any response type
-        hop_start = packet.get("hopStart", 0)
-        hop_limit = packet.get("hopLimit", 0)
-        hops_away = max(0, hop_start - hop_limit)
-        if hops_away > 0:
-            result_lines.append(f"\nPacket hops: {hops_away}")
-        
-        # Add signal quality if available
+        # Add basic packet info for any response type, signal quality if
+        # available, and the completion timestamp
+        hops_away = packet.get("hopStart", 0) - packet.get("hopLimit", 0)
         rssi = packet.get("rxRssi")
         snr = packet.get("rxSnr")
-        if rssi is not None or snr is not None:
-            signal_parts = []
-            if rssi is not None:
-                signal_parts.append(f"RSSI: {rssi}dBm")
-            if snr is not None:
-                signal_parts.append(f"SNR: {snr:.2f}dB")
-            result_lines.append(", ".join(signal_parts))
-            
-        # Add timestamp
-        current_timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        result_lines.append(f"\nCompleted at: {current_timestamp}")
-            
-        result_msg = "\n".join(result_lines)
+        signal = ", ".join(
+            ([f"RSSI: {rssi}dBm"] if rssi is not None else []) +
+            ([f"SNR: {snr:.2f}dB"] if snr is not None else [])
+        )
+        result_msg = (
+            "\n".join(result_lines) +
+            (f"\n\nPacket hops: {hops_away}" if hops_away > 0 else "") +
+            (f"\n{signal}" if signal else "") +
+            f"\n\nCompleted at: {time_of_day()}"
+        )
         
         # Log the result to console
         log_console_and_web(f"Traceroute completed for {sender_name}", "green")
-        log_web(f"Traceroute completed for {sender_name}", "green")
         
         # Send the result back to the user
         reply_messages = split_message(result_msg)
@@ -339,7 +416,6 @@ def handle_traceroute_response_packet(packet, interface):
         
     except Exception as e:
         log_console_and_web(f"Error handling traceroute response: {e}", "red")
-        log_web(f"Error handling traceroute response: {e}", "red")
 
 
 def on_receive(packet=None, interface=None, **kwargs):
@@ -350,42 +426,40 @@ def on_receive(packet=None, interface=None, **kwargs):
         return
     
     # Handle different packet types
-    packet_type = packet.get("decoded", {}).get("portnum")
+    decoded = packet.get("decoded") or {}
+    packet_type = decoded.get("portnum")
     sender_id = packet.get("fromId")
     
     # Update database for ALL packets that have a sender ID
     # This ensures we capture telemetry, position, and any other data from any packet type
     if sender_id:
-        update_node_info(sender_id, packet_info=packet)
-        sender_name = get_node_name(sender_id)
-        
-        # Log specific packet types with appropriate messages
-        if packet_type == meshtastic.portnums_pb2.NODEINFO_APP:
-            log_console_and_web(f"Updated node info for {sender_name} ({sender_id})", "blue")
-            log_web(f"Updated node info for {sender_name} ({sender_id})", "blue")
-        elif packet_type == meshtastic.portnums_pb2.NEIGHBORINFO_APP:
-            log_console_and_web(f"Updated neighbor info for {sender_name} ({sender_id})", "blue")
-            log_web(f"Updated neighbor info for {sender_name} ({sender_id})", "blue")
-        elif packet_type == meshtastic.portnums_pb2.TELEMETRY_APP:
-            log_console_and_web(f"Updated telemetry for {sender_name} ({sender_id})", "blue")
-            log_web(f"Updated telemetry for {sender_name} ({sender_id})", "blue")
-        elif packet_type == meshtastic.portnums_pb2.POSITION_APP:
-            log_console_and_web(f"Updated position for {sender_name} ({sender_id})", "blue")
-            log_web(f"Updated position for {sender_name} ({sender_id})", "blue")
+        label = NODE_UPDATE_LABELS.get(packet_type)
+        if not label:
+            # Other packets only refresh last heard/signal data, so throttle them
+            update_node_metadata(sender_id, packet)
+        else:
+            update_node_info(sender_id, packet_info=packet)
+            
+            # Log specific packet types with appropriate messages
+            sender_name = get_node_name(sender_id)
+            log_console_and_web(f"Updated {label} for {sender_name} ({sender_id})", "blue")
+            return  # Housekeeping packets carry no text
     
     # Handle text messages (existing functionality)
-    if "decoded" not in packet or "text" not in packet["decoded"]:
+    text = decoded.get("text")
+    if not text:
         return
     
     # Basic input validation
     try:
-        msg = packet["decoded"]["text"].strip().lower()
+        msg = text.strip().lower()
         if len(msg) > 200:  # Reasonable limit for Meshtastic messages
             return
         
         sender = get_sender_name(packet)
         sender_id = packet.get("fromId", sender)
-        message_origin = get_message_origin(packet)
+        # Broadcast/channel message or direct message
+        message_origin = "Channel" if packet.get("toId", "") in BROADCAST_DESTINATIONS else "DM"
         
         # Sanitize sender name for logging
         if sender and len(sender) > 50:
@@ -393,38 +467,28 @@ def on_receive(packet=None, interface=None, **kwargs):
 
         log_console_web_and_discord(f"Incoming from {sender} via {message_origin}: '{msg}'", "cyan", True)
 
-        # Handle DM-only commands (help and about)
-        if message_origin == "DM" and msg in DM_COMMANDS:
-            now = time.time()
-            if sender_id in last_reply_time and (now - last_reply_time[sender_id]) < REPLY_COOLDOWN:
-                log_console_and_web(f"Rate-limited reply to {sender}", "yellow")
-                return
+        command, ping_count = classify_command(msg, message_origin == "DM")
+        if command is None:
+            return
+        
+        # All commands share the per-sender reply cooldown
+        now = time.monotonic()
+        if sender_id in last_reply_time and (now - last_reply_time[sender_id]) < REPLY_COOLDOWN:
+            log_console_and_web(f"Rate-limited reply to {sender}", "yellow")
+            return
+
+        record_reply_time(sender_id, now)
 
-            last_reply_time[sender_id] = now
-            
-            # Generate appropriate response based on command
-            if msg in ["help", "/help"]:
-                reply = get_help_response()
-            elif msg in ["about", "/about"]:
-                reply = get_about_response()
-            
-            # Split the reply into multiple messages if needed
-            reply_messages = split_message(reply)
+        # Handle DM-only commands (help and about) with the pre-split responses
+        if command in ("help", "about"):
+            reply_messages = HELP_MESSAGES if command == "help" else ABOUT_MESSAGES
             
             # Send reply asynchronously to avoid blocking message reception
             send_messages_async(interface, reply_messages, packet["fromId"], sender, "DM Help/About")
             return
 
         # Handle traceroute command separately (special rate limiting)
-        if msg == "traceroute":
-            # Check regular rate limit first
-            now = time.time()
-            if sender_id in last_reply_time and (now - last_reply_time[sender_id]) < REPLY_COOLDOWN:
-                log_console_and_web(f"Rate-limited reply to {sender}", "yellow")
-                return
-
-            last_reply_time[sender_id] = now
-            
+        if command == "traceroute":
             # Queue the traceroute request
             success, message = queue_traceroute(interface, packet["fromId"], sender, sender_id)
             
@@ -435,48 +499,24 @@ def on_receive(packet=None, interface=None, **kwargs):
                 reply = f"Traceroute failed: {message}"
                 log_console_and_web(f"Traceroute failed for {sender}: {message}", "yellow")
             
-            reply_messages = split_message(reply)
-            send_messages_async(interface, reply_messages, packet["fromId"], sender, "Traceroute Queue")
+            send_single_async(interface, reply, packet["fromId"], sender, "Traceroute Queue")
             return
 
         # Handle existing triggers (ping, hello, test) - work in both channels and DMs
-        ping_count = 1
-        if msg in TRIGGERS or (msg.startswith("ping ") and len(msg.split()) == 2):
-            # Check for "ping N" format
-            if msg.startswith("ping ") and len(msg.split()) == 2:
-                try:
-                    ping_count = int(msg.split()[1])
-                    if ping_count < 1 or ping_count > 5:
-                        ping_count = 1  # Default to 1 if out of range
-                except ValueError:
-                    ping_count = 1  # Default to 1 if not a valid number
-            elif msg not in TRIGGERS:
-                return  # Not a valid trigger
-                
-            now = time.time()
-            if sender_id in last_reply_time and (now - last_reply_time[sender_id]) < REPLY_COOLDOWN:
-                log_console_and_web(f"Rate-limited reply to {sender}", "yellow")
-                return
-
-            last_reply_time[sender_id] = now
-            rssi, snr = extract_rssi_snr(packet)
-            hop_start = packet.get("hopStart", None)
-            hop_limit = packet.get("hopLimit", None)
-            hop_count = hop_start - hop_limit if hop_start and hop_limit else None
-
-            # Generate multiple pong responses based on ping_count
-            reply_messages = []
-            for i in range(ping_count):
-                reply = f"pong ({timestamp()}) RSSI: {rssi} SNR: {snr}"
-                if hop_count is not None:
-                    reply += f" Hops: {hop_count}/{hop_start}"
-                
-                # Split each reply into multiple messages if needed
-                split_replies = split_message(reply)
-                reply_messages.extend(split_replies)
-            
-            # Send replies asynchronously to avoid blocking message reception
-            send_messages_async(interface, reply_messages, packet["fromId"], sender, "Reply")
+        rssi, snr = extract_rssi_snr(packet)
+        hop_start = packet.get("hopStart", None)
+        hop_limit = packet.get("hopLimit", None)
+        hop_count = hop_start - hop_limit if hop_start and hop_limit else None
+
+        # Build the pong once and repeat it ping_count times
+        reply = f"pong ({timestamp()}) RSSI: {rssi} SNR: {snr}"
+        if hop_count is not None:
+            reply += f" Hops: {hop_count}/{hop_start}"
+        reply_messages = split_message(reply) * ping_count
+        
+        # Send replies asynchronously to avoid blocking message reception; each
+        # pong is its own reply, so they are never merged into one packet
+        send_messages_async(interface, reply_messages, packet["fromId"], sender, "Reply", coalesce=False)
             
     except Exception as e:
         # Log error without exposing sensitive details
@@ -485,165 +525,130 @@ def on_receive(packet=None, interface=None, **kwargs):
 
 def handle_socket_error():
     """Handle socket errors detected from any source"""
-    global is_connected, socket_error_count
+    global is_connected
     
-    with socket_error_lock:
-        socket_error_count += 1
-        if socket_error_count >= 1:  # Immediate response to socket errors
-            if is_connected:
-                log_console_and_web("Socket error detected - marking connection as failed", "red")
-                is_connected = False
-                # Reset counter after marking disconnected
-                socket_error_count = 0
+    # Immediate response to socket errors
+    if is_connected:
+        socket_error_flag.set()
+        log_console_and_web("Socket error detected - marking connection as failed", "red")
+        is_connected = False
+        connected_event.clear()
+
+
+def on_connection_lost(interface=None, **kwargs):
+    """Handle the library's connection-lost event for the active interface"""
+    # Ignore events from interfaces we already replaced or closed ourselves
+    if interface is not None and interface is get_interface():
+        log_console_and_web("Radio reported connection lost", "red")
+        handle_socket_error()
 
 
 def cleanup_interface():
     """Safely cleanup the interface connection"""
     global interface
+    connected_event.clear()
     if interface:
+        # Detach the interface before closing it, so the connection-lost event
+        # its close() publishes is ignored by on_connection_lost
+        closing_interface = interface
+        interface = None
+        
         try:
             # First try to gracefully disconnect
-            if hasattr(interface, '_sendDisconnect'):
-                interface._sendDisconnect()
+            if hasattr(closing_interface, '_sendDisconnect'):
+                closing_interface._sendDisconnect()
         except:
             # Ignore errors during disconnect
             pass
         
         try:
             # Then close the connection
-            interface.close()
+            closing_interface.close()
         except (BrokenPipeError, ConnectionResetError, OSError):
             # Expected when connection is already broken
             pass
         except Exception:
             # Ignore other errors during cleanup
             pass
-        finally:
-            interface = None
 
 
 def monitor_connection():
     """Monitor connection and reconnect if needed"""
     global is_connected, interface, reconnect_thread, local_radio_name
     
-    backoff = 2
+    base_backoff = 2
     max_backoff = 60
+    backoff = base_backoff
     
     while not shutdown_event.is_set():
         try:
             if not is_connected:
                 log_console_and_web("Attempting connection to radio...", "yellow")
-                log_web("Attempting connection to radio...", "yellow")
                 
                 with connection_lock:
                     cleanup_interface()
-                    
-                    try:
-                        # Create interface based on connection type
-                        if CONNECTION_TYPE == "serial":
-                            if SERIAL_DEVICE:
-                                log_console_and_web(f"Connecting via serial to {SERIAL_DEVICE}...", "yellow")
-                                log_web(f"Connecting via serial to {SERIAL_DEVICE}...", "yellow")
-                                interface = meshtastic.serial_interface.SerialInterface(devPath=SERIAL_DEVICE)
-                            else:
-                                log_console_and_web("Connecting via serial (auto-detect)...", "yellow")
-                                log_web("Connecting via serial (auto-detect)...", "yellow")
-                                interface = meshtastic.serial_interface.SerialInterface()
-                        else:  # tcp
-                            log_console_and_web(f"Connecting via TCP to {DEVICE_IP}...", "yellow")
-                            log_web(f"Connecting via TCP to {DEVICE_IP}...", "yellow")
-                            interface = meshtastic.tcp_interface.TCPInterface(hostname=DEVICE_IP)
-                        
-                        pub.subscribe(on_receive, "meshtastic.receive")
-                        is_connected = True
-                        backoff = 2  # Reset backoff on successful connection
-                        
-                        # Reset socket error count on successful connection
-                        with socket_error_lock:
-                            socket_error_count = 0
-                        
-                        # Get the local radio name after successful connection
-                        try:
-                            # Wait a moment for the interface to be fully ready
-                            time.sleep(2)
-                            local_radio_name = get_local_radio_name(interface)
-                            set_local_radio_name(local_radio_name)
-                            if local_radio_name:
-                                log_console_and_web(f"Retrieved local radio name: {local_radio_name}", "cyan")
-                                log_web(f"Retrieved local radio name: {local_radio_name}", "cyan")
-                            else:
-                                log_console_and_web("Could not retrieve local radio name", "yellow")
-                                log_web("Could not retrieve local radio name", "yellow")
-                        except Exception as e:
-                            log_console_and_web("Failed to retrieve local radio name", "yellow")
-                            log_web("Failed to retrieve local radio name", "yellow")
-                            local_radio_name = ""
-                        
-                        # Download nodedb after successful connection
-                        try:
-                            from database import cleanup_old_nodes
-                            # Import these functions dynamically to avoid circular imports
-                            try:
-                                from database import enhanced_download_nodedb, schedule_periodic_nodedb_refresh
-                            except ImportError:
-                                # These functions need to be implemented in database module
-                                def enhanced_download_nodedb(interface):
-                                    log_console_and_web("NodeDB download placeholder - not implemented", "yellow")
-                                    return True
-                                def schedule_periodic_nodedb_refresh(interface, hours):
-                                    log_console_and_web("NodeDB refresh scheduling placeholder - not implemented", "yellow")
-                            
-                            enhanced_download_nodedb(interface)
-                            # Clean up old nodes (older than 30 days)
-                            cleanup_old_nodes(30)
-                            # Schedule periodic nodedb refresh (every 6 hours)
-                            schedule_periodic_nodedb_refresh(interface, 6)
-                        except Exception as e:
-                            log_console_and_web(f"Failed to download nodedb: {e}", "yellow")
-                            log_web(f"Failed to download nodedb: {e}", "yellow")
-                        
-                        log_console_and_web("Connected to Meshtastic radio", "green", True)
-                        log_web("Connected to Meshtastic radio", "green", True)
-                        
-                    except (BrokenPipeError, ConnectionResetError, OSError) as e:
-                        log_console_and_web("Connection failed: socket error during interface creation", "red")
-                        log_web("Connection failed: socket error during interface creation", "red")
-                        cleanup_interface()
-                        raise
-                    except Exception as e:
-                        log_console_and_web("Connection failed: unable to create interface", "red")
-                        log_web("Connection failed: unable to create interface", "red")
-                        cleanup_interface()
-                        raise
                 
-            # Enhanced connection health check
-            # This helps detect broken pipes and connection issues early
-            connection_healthy = False
-            try:
-                if interface and is_connected:
-                    # Try multiple lightweight operations to test connection health
-                    interface.getMyNodeInfo()
-                    # Small delay to allow any background thread errors to surface
-                    time.sleep(1)
-                    # If we get here without exception, connection seems healthy
-                    connection_healthy = True
-                    
-            except (BrokenPipeError, ConnectionResetError, OSError):
-                log_console_and_web("Connection health check failed: socket error detected", "red")
-                log_web("Connection health check failed: socket error detected", "red")
-                handle_socket_error()
+                # Create the interface outside the lock; this can take seconds
+                try:
+                    if CONNECTION_TYPE == "serial":
+                        if SERIAL_DEVICE:
+                            log_console_and_web(f"Connecting via serial to {SERIAL_DEVICE}...", "yellow")
+                            new_interface = meshtastic.serial_interface.SerialInterface(devPath=SERIAL_DEVICE)
+                        else:
+                            log_console_and_web("Connecting via serial (auto-detect)...", "yellow")
+                            new_interface = meshtastic.serial_interface.SerialInterface()
+                    else:  # tcp
+                        log_console_and_web(f"Connecting via TCP to {DEVICE_IP}...", "yellow")
+                        new_interface = meshtastic.tcp_interface.TCPInterface(hostname=DEVICE_IP)
+                except (BrokenPipeError, ConnectionResetError, OSError) as e:
+                    log_console_and_web("Connection failed: socket error during interface creation", "red")
+                    raise
+                except Exception as e:
+                    log_console_and_web("Connection failed: unable to create interface", "red")
+                    raise
+                
+                # Reset socket error state before publishing, so an error on the
+                # new connection is never cleared away
+                socket_error_flag.clear()
+                
+                # Only publishing the new interface needs the lock
                 with connection_lock:
-                    cleanup_interface()
-                continue
-            except Exception as e:
-                # For other exceptions, don't immediately fail the connection
-                # but log the issue
-                log_console_and_web("Connection health check warning: operation failed", "yellow")
-                log_web("Connection health check warning: operation failed", "yellow")
-                connection_healthy = True  # Don't fail on non-socket errors
-            
-            if connection_healthy:
-                time.sleep(10)  # Check more frequently to catch issues sooner
+                    interface = new_interface
+                    is_connected = True
+                connected_event.set()
+                backoff = base_backoff  # Reset backoff on successful connection
+                
+                # Get the local radio name after successful connection
+                try:
+                    # Wait a moment for the interface to be fully ready
+                    time.sleep(2)
+                    local_radio_name = get_local_radio_name(new_interface)
+                    set_local_radio_name(local_radio_name)
+                    if local_radio_name:
+                        log_console_and_web(f"Retrieved local radio name: {local_radio_name}", "cyan")
+                    else:
+                        log_console_and_web("Could not retrieve local radio name", "yellow")
+                except Exception as e:
+                    log_console_and_web("Failed to retrieve local radio name", "yellow")
+                    local_radio_name = ""
+                
+                # Download nodedb after successful connection
+                try:
+                    enhanced_download_nodedb(new_interface)
+                    # Clean up old nodes (older than 30 days)
+                    cleanup_old_nodes(30)
+                    # Schedule periodic nodedb refresh (every 6 hours)
+                    schedule_periodic_nodedb_refresh(new_interface, 6)
+                except Exception as e:
+                    log_console_and_web(f"Failed to download nodedb: {e}", "yellow")
+                
+                log_console_and_web("Connected to Meshtastic radio", "green", True)
+                
+            # Disconnects are reported by on_connection_lost and the socket
+            # error hooks, which clear is_connected and set socket_error_flag;
+            # wait on the flag so a reconnect starts immediately
+            if is_connected:
+                socket_error_flag.wait(10)
             
         except (BrokenPipeError, ConnectionResetError, OSError) as e:
             log_console_and_web("Connection failed: socket error (radio disconnected)", "red")
@@ -653,9 +658,10 @@ def monitor_connection():
                 cleanup_interface()
             
             if not shutdown_event.is_set():
-                log_console_and_web(f"Retrying in {backoff} seconds...", "yellow")
+                # Decorrelated jitter keeps restarting bots from retrying in lockstep
+                backoff = min(max_backoff, random.uniform(base_backoff, backoff * 3))
+                log_console_and_web(f"Retrying in {backoff:.1f} seconds...", "yellow")
                 shutdown_event.wait(backoff)
-                backoff = min(backoff * 2, max_backoff)
         except Exception as e:
             is_connected = False
             # Don't expose detailed error information
@@ -665,14 +671,19 @@ def monitor_connection():
                 cleanup_interface()
             
             if not shutdown_event.is_set():
-                log_console_and_web(f"Retrying in {backoff} seconds...", "yellow")
+                # Decorrelated jitter keeps restarting bots from retrying in lockstep
+                backoff = min(max_backoff, random.uniform(base_backoff, backoff * 3))
+                log_console_and_web(f"Retrying in {backoff:.1f} seconds...", "yellow")
                 shutdown_event.wait(backoff)
-                backoff = min(backoff * 2, max_backoff)
 
 
 def start_connection_monitor():
     """Start the connection monitoring thread"""
     global reconnect_thread
+    # Register the receive listener once; it survives reconnects since the
+    # library publishes every interface's packets on the same topic
+    pub.subscribe(on_receive, "meshtastic.receive")
+    pub.subscribe(on_connection_lost, "meshtastic.connection.lost")
     if reconnect_thread is None or not reconnect_thread.is_alive():
         reconnect_thread = threading.Thread(target=monitor_connection, daemon=True)
         reconnect_thread.start()
@@ -682,56 +693,43 @@ def connect_radio():
     """Initialize radio connection with monitoring"""
     start_connection_monitor()
     
-    # Wait for initial connection
-    timeout = 60  # 60 seconds timeout for initial connection
-    start_time = time.time()
-    while not is_connected and (time.time() - start_time) < timeout:
-        time.sleep(1)
-    
-    if not is_connected:
+    # Wait for initial connection (60 seconds timeout)
+    if not connected_event.wait(timeout=60):
         log_console_and_web("Failed to establish initial connection within timeout", "red")
         raise ConnectionError("Failed to connect to radio")
     
     return interface
 
 
-def enhanced_download_nodedb(interface, retry_on_failure=True):
-    """Enhanced nodedb download with retry logic - placeholder for now"""
-    # This function will be implemented by importing from database or other module
-    pass
-
-
-def schedule_periodic_nodedb_refresh(interface, interval_hours=24):
-    """Schedule periodic nodedb refresh - placeholder for now"""
-    # This function will be implemented by importing from database or other module
-    pass
-
-
 def setup_exception_handlers():
     """Setup custom exception handlers for socket error detection"""
     # Override default exception handler to catch background thread errors
     original_excepthook = sys.excepthook
+    original_threading_excepthook = getattr(threading, 'excepthook', None)
+    socket_errors = (BrokenPipeError, ConnectionResetError, OSError)
 
     def custom_excepthook(exc_type, exc_value, exc_traceback):
         """Custom exception handler to catch main thread socket errors"""
-        if issubclass(exc_type, (BrokenPipeError, ConnectionResetError, OSError)):
-            print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Main thread socket error detected: {exc_type.__name__}")
-            try:
-                handle_socket_error()
-            except NameError:
-                original_excepthook(exc_type, exc_value, exc_traceback)
-        else:
+        # Anything else goes straight to the default handler
+        if not issubclass(exc_type, socket_errors):
+            return original_excepthook(exc_type, exc_value, exc_traceback)
+        print(f"[{timestamp()}] Main thread socket error detected: {exc_type.__name__}")
+        try:
+            handle_socket_error()
+        except NameError:
             original_excepthook(exc_type, exc_value, exc_traceback)
 
     def custom_threading_excepthook(args):
         """Custom exception handler for background thread socket errors"""
-        if issubclass(args.exc_type, (BrokenPipeError, ConnectionResetError, OSError)):
-            print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Background thread socket error detected: {args.exc_type.__name__}")
-            try:
-                handle_socket_error()
-            except NameError:
-                # If handle_socket_error is not yet defined, just print the error
-                print(f"Socket error in thread {args.thread.name}: {args.exc_value}")
+        # Anything else goes straight to the default handler
+        if not issubclass(args.exc_type, socket_errors):
+            return original_threading_excepthook(args)
+        print(f"[{timestamp()}] Background thread socket error detected: {args.exc_type.__name__}")
+        try:
+            handle_socket_error()
+        except NameError:
+            # If handle_socket_error is not yet defined, just print the error
+            print(f"Socket error in thread {args.thread.name}: {args.exc_value}")
 
     sys.excepthook = custom_excepthook
     # Set threading excepthook if available (Python 3.8+)
@@ -743,4 +741,5 @@ def stop_connection():
     """Stop the connection gracefully"""
     global shutdown_event
     shutdown_event.set()
+    socket_error_flag.set()  # Wake monitor_connection so it sees the shutdown
     cleanup_interface()
\ No newline at end of file
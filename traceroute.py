@@ -7,7 +7,8 @@ System Architecture:
 -------------------
 1. User sends "traceroute" command via Meshtastic
 2. Request is queued in traceroute_queue (FIFO, thread-safe)
-3. Worker thread (traceroute_worker) processes requests sequentially
+3. Worker thread (traceroute_worker) processes requests sequentially,
+   round-robin across requesters
 4. Before sending, worker checks if TRACEROUTE_RATE_LIMIT seconds have passed
 5. If not, worker waits the remaining time to respect firmware limits
 6. Traceroute is sent and response is awaited (with TRACEROUTE_TIMEOUT)
@@ -27,26 +28,126 @@ preventing firmware rejections and timeout errors.
 import queue
 import time
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
+from meshtastic import mesh_pb2, portnums_pb2
 from config import TRACEROUTE_RATE_LIMIT, MAX_QUEUE_PER_USER
+from logging_utils import log_console_and_web, log_console_web_and_discord, time_of_day
 
 # Traceroute system globals
-# Initialize to a very old timestamp to ensure first request is sent immediately
-# When bot starts, any request will have time_since_last >> TRACEROUTE_RATE_LIMIT
-last_traceroute_time = 0  # Will be compared against current time.time()
+# Initialize a full rate-limit window in the past to ensure first request is sent
+# immediately. Times come from time.monotonic(), which may start near zero at boot
+# but never jumps when the wall clock is stepped (e.g. by NTP).
+last_traceroute_time = -TRACEROUTE_RATE_LIMIT  # Compared against time.monotonic()
 TRACEROUTE_TIMEOUT = 15  # seconds to wait for traceroute response
+UNK_SNR = -128  # RouteDiscovery SNR placeholder for hops that did not report one
+# Traceroute requests carry an empty RouteDiscovery, so serialize it once;
+# sendData accepts the bytes as-is
+EMPTY_ROUTE_DISCOVERY = mesh_pb2.RouteDiscovery().SerializeToString()
 
 # User-specific traceroute queues
-traceroute_queues = defaultdict(list)  # user_id -> list of pending requests
+traceroute_queues = defaultdict(int)  # user_id -> number of queued requests
+queued_traceroute_count = 0  # Sum of traceroute_queues, kept alongside it
+traceroute_queues_lock = threading.Lock()  # Guards traceroute_queues and queued_traceroute_count
 
 # Traceroute processing 
-traceroute_queue = queue.Queue()  # Thread-safe queue for traceroute requests
+TRACEROUTE_QUEUE_MAX = 128  # Bound on queued and batched requests across all users
+traceroute_queue = queue.Queue()  # Thread-safe queue for traceroute requests, bounded by queue_traceroute()
+TRACEROUTE_DRAIN_LIMIT = 32  # Max requests the worker pulls off the queue at once
 traceroute_shutdown = threading.Event()
 traceroute_thread = None
 pending_traceroutes = {}  # Keep track of pending traceroute requests by user (sender_id -> request_data)
+pending_lock = threading.Lock()  # Guards claiming entries in pending_traceroutes
+
+# Outgoing replies, sent by message_sender_worker
+send_queue = queue.Queue()  # (interface, messages, destination_id, sender_name, message_type, coalesce) tuples
+sender_thread = None
 
 # Message splitting
 MAX_MESSAGE_LENGTH = 200  # Meshtastic practical message limit
+MAX_PAYLOAD_BYTES = mesh_pb2.Constants.DATA_PAYLOAD_LEN  # the radio's per-packet limit
+
+# Pacing between the parts of a multi-part reply
+RADIO_QUEUE_MIN_FREE = 3  # free radio TX slots below which parts are paced
+MIN_MESSAGE_GAP = 0.1  # seconds, even when the ACK arrives sooner
+ACK_WAIT_TIMEOUT = 2.0  # seconds to wait for a part's ACK before sending the next
+
+
+# Connection helpers from meshtastic_handler. That module imports this one, so
+# they are bound once by bind_connection_helpers() when the workers start; until
+# then (and for testing or standalone use) these fallbacks are used
+def get_connection_status():
+    return True, 0
+
+
+def update_message_queue_count(delta):
+    pass
+
+
+def handle_socket_error():
+    pass
+
+
+def cleanup_interface():
+    pass
+
+
+connection_lock = threading.Lock()
+
+
+def bind_connection_helpers():
+    """Resolve the connection helpers from meshtastic_handler, if available."""
+    global get_connection_status, update_message_queue_count, handle_socket_error, cleanup_interface, connection_lock
+    try:
+        from meshtastic_handler import (get_connection_status, update_message_queue_count,
+                                        handle_socket_error, cleanup_interface, connection_lock)
+    except ImportError:
+        pass  # Keep the fallbacks
+
+
+def add_pending_traceroute(sender_id, request_data):
+    """
+    Record an in-flight traceroute so its response can be matched.
+    
+    request_data may carry an 'event' (threading.Event); whichever call
+    claims the entry sets it, waking the worker waiting on the response.
+    """
+    with pending_lock:
+        pending_traceroutes[sender_id] = request_data
+
+
+def pop_pending_traceroute(sender_id):
+    """Remove and return the pending traceroute for sender_id, or None."""
+    with pending_lock:
+        request_data = pending_traceroutes.pop(sender_id, None)
+        if request_data is not None:
+            notify_traceroute_claimed(request_data)
+        return request_data
+
+
+def expire_pending_traceroutes(max_age):
+    """
+    Drop pending traceroutes registered more than max_age seconds ago.
+    
+    The worker normally claims its own entry once TRACEROUTE_TIMEOUT passes;
+    this bounds the registry if an entry is ever left behind.
+    
+    Returns:
+        int: Number of entries dropped
+    """
+    cutoff = time.monotonic() - max_age
+    with pending_lock:
+        expired = [sender_id for sender_id, request_data in pending_traceroutes.items()
+                   if request_data['timestamp'] < cutoff]
+        for sender_id in expired:
+            notify_traceroute_claimed(pending_traceroutes.pop(sender_id))
+    return len(expired)
+
+
+def notify_traceroute_claimed(request_data):
+    """Wake the worker waiting on a pending traceroute that was just claimed."""
+    event = request_data.get('event')
+    if event is not None:
+        event.set()
 
 
 def split_message(text, max_length=MAX_MESSAGE_LENGTH):
@@ -56,75 +157,139 @@ def split_message(text, max_length=MAX_MESSAGE_LENGTH):
     """
     if len(text) <= max_length:
         return [text]
+    return list(iter_message_parts(text, max_length))
+
+
+def iter_message_parts(text, max_length=MAX_MESSAGE_LENGTH):
+    """
+    Yield the parts of split_message() for text longer than max_length.
     
-    messages = []
-    remaining = text.strip()
+    Walks index bounds over the original string instead of re-slicing the
+    remaining text after every part, so each character is copied once.
+    """
+    # Bounds of the text with surrounding whitespace stripped
+    start, end = 0, len(text)
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
     
-    while remaining:
-        if len(remaining) <= max_length:
-            messages.append(remaining)
-            break
+    while start < end:
+        if end - start <= max_length:
+            yield text[start:end]
+            return
         
         # Find the best split point within max_length
-        split_point = max_length
+        limit = start + max_length
+        half = start + max_length // 2
+        split_point = limit
         
-        # Try to split at sentence boundaries first (. ! ?)
-        for i in range(max_length - 1, max_length // 2, -1):
-            if remaining[i] in '.!?':
-                # Check if there's space after the punctuation
-                if i + 1 < len(remaining) and remaining[i + 1] == ' ':
-                    split_point = i + 1
-                    break
+        # Try to split at sentence boundaries first (. ! ? followed by a space)
+        i = max(text.rfind('. ', half + 1, limit + 1),
+                text.rfind('! ', half + 1, limit + 1),
+                text.rfind('? ', half + 1, limit + 1))
+        if i >= 0:
+            split_point = i + 1
         
-        # If no sentence boundary found, try to split at word boundaries
-        if split_point == max_length:
-            for i in range(max_length - 1, max_length // 2, -1):
-                if remaining[i] == ' ':
-                    split_point = i
-                    break
+        # If no sentence boundary found, split at the last space before
+        # max_length to avoid breaking words, or just split at max_length.
+        # (Searching the back half first and then the rest found the same space.)
+        if split_point == limit:
+            i = text.rfind(' ', start + 1, limit)
+            if i >= 0:
+                split_point = i
         
-        # If no good split point found, just split at max_length
-        if split_point == max_length and len(remaining) > max_length:
-            # Find last space before max_length to avoid breaking words
-            for i in range(max_length - 1, 0, -1):
-                if remaining[i] == ' ':
-                    split_point = i
-                    break
-        
-        # Extract the message part and add to list
-        message_part = remaining[:split_point].rstrip()
-        if message_part:
-            messages.append(message_part)
+        # Emit the part without trailing whitespace
+        part_end = split_point
+        while part_end > start and text[part_end - 1].isspace():
+            part_end -= 1
+        if part_end > start:
+            yield text[start:part_end]
         
-        # Update remaining text
-        remaining = remaining[split_point:].lstrip()
+        # Skip leading whitespace of the remaining text
+        start = split_point
+        while start < end and text[start].isspace():
+            start += 1
+
+
+def coalesce_messages(messages):
+    """
+    Greedily merge adjacent parts of one split text while they fit in a single packet.
     
-    return messages
+    split_message() counts characters against MAX_MESSAGE_LENGTH, which leaves
+    headroom below the radio's byte limit; parts whose UTF-8 length together
+    fits within MAX_PAYLOAD_BYTES are cheaper to send as one packet.
+    """
+    merged = []
+    for message in messages:
+        if merged and len(f"{merged[-1]} {message}".encode('utf-8')) <= MAX_PAYLOAD_BYTES:
+            merged[-1] = f"{merged[-1]} {message}"
+        else:
+            merged.append(message)
+    return merged
+
+
+def report_send_failure(error, index, total_messages):
+    """
+    Log a failed send and, for socket errors, mark the connection as lost.
+    """
+    if isinstance(error, (BrokenPipeError, ConnectionResetError, OSError)):
+        log_console_and_web(f"Failed to send message {index}/{total_messages}: socket error (connection lost)", "red")
+        handle_socket_error()
+        # Trigger immediate cleanup in background
+        with connection_lock:
+            cleanup_interface()
+    else:
+        log_console_and_web(f"Failed to send message {index}/{total_messages}: operation error", "red")
+        # Don't mark as disconnected for non-socket errors, but still fail the send
+
+
+def radio_queue_congested(interface):
+    """
+    Check whether the radio's transmit queue is close to full.
+    
+    Uses the free slot count from the firmware's last QueueStatus report, which
+    the library keeps in interface.queueStatus (None until the radio sends one).
+    """
+    queue_status = getattr(interface, 'queueStatus', None)
+    return queue_status is not None and queue_status.free < RADIO_QUEUE_MIN_FREE
+
+
+def send_text_fast(interface, text, destination_id):
+    """
+    Send a single message with no pacing.
+    Returns True if the message was sent successfully, False otherwise.
+    """
+    is_connected, message_queue_count = get_connection_status()
+    
+    if not interface or not is_connected:
+        log_console_and_web("Cannot send messages: not connected", "red")
+        return False
+    
+    update_message_queue_count(1)
+    try:
+        interface.sendText(text, destinationId=destination_id)
+        return True
+    except Exception as e:
+        report_send_failure(e, 1, 1)
+        return False
+    finally:
+        update_message_queue_count(-1)
 
 
-def send_multiple_messages(interface, messages, destination_id):
+def send_multiple_messages(interface, messages, destination_id, coalesce=True):
     """
     Send multiple messages in sequence with proper error handling.
+    Set coalesce=False when messages are separate replies rather than parts of one text.
     Returns True if all messages were sent successfully, False otherwise.
     """
-    from logging_utils import log_console_and_web, log_web
-    import time
+    # Parts of one split text share a packet when they fit its byte limit
+    if coalesce:
+        messages = coalesce_messages(messages)
     
-    # Import these dynamically to avoid circular imports
-    try:
-        from meshtastic_handler import get_connection_status, update_message_queue_count, handle_socket_error, cleanup_interface, connection_lock
-    except ImportError:
-        # Fallback for testing or standalone use
-        def get_connection_status():
-            return True, 0
-        def update_message_queue_count(delta):
-            pass
-        def handle_socket_error():
-            pass
-        def cleanup_interface():
-            pass
-        import threading
-        connection_lock = threading.Lock()
+    # Most replies fit in one message and need none of the multi-part handling
+    if len(messages) == 1:
+        return send_text_fast(interface, messages[0], destination_id)
     
     is_connected, message_queue_count = get_connection_status()
     
@@ -135,61 +300,112 @@ def send_multiple_messages(interface, messages, destination_id):
     success_count = 0
     total_messages = len(messages)
     
-    for i, message in enumerate(messages, 1):
-        try:
-            update_message_queue_count(1)
-            interface.sendText(message, destinationId=destination_id)
-            update_message_queue_count(-1)
-            success_count += 1
-            
-            # Small delay between messages to avoid overwhelming the radio
-            if i < total_messages:
-                time.sleep(0.5)
+    # Count the whole batch as queued until it has been sent or has failed
+    update_message_queue_count(total_messages)
+    try:
+        for i, message in enumerate(messages, 1):
+            try:
+                # Only pace the next part while the radio is congested; otherwise
+                # the library and firmware queue back-to-back parts themselves
+                paced = i < total_messages and radio_queue_congested(interface)
+                if paced:
+                    # More parts follow: ask for an ACK so the next part can be paced
+                    # on delivery instead of a fixed delay. The library only passes
+                    # ACKs to response callbacks named onAckNak.
+                    acked = threading.Event()
+                    def onAckNak(packet, acked=acked):
+                        acked.set()
+                    interface.sendText(message, destinationId=destination_id, wantAck=True, onResponse=onAckNak)
+                    sent_at = time.monotonic()
+                else:
+                    interface.sendText(message, destinationId=destination_id)
+                success_count += 1
                 
-        except (BrokenPipeError, ConnectionResetError, OSError) as e:
-            update_message_queue_count(-1)
-            log_console_and_web(f"Failed to send message {i}/{total_messages}: socket error (connection lost)", "red")
-            handle_socket_error()
-            # Trigger immediate cleanup in background
-            with connection_lock:
-                cleanup_interface()
-            return False
-        except Exception as e:
-            update_message_queue_count(-1)
-            log_console_and_web(f"Failed to send message {i}/{total_messages}: operation error", "red")
-            # Don't mark as disconnected for non-socket errors, but still fail the send
-            return False
+                # Delay between messages to avoid overwhelming the radio: wait for the
+                # ACK (or ACK_WAIT_TIMEOUT), but never less than MIN_MESSAGE_GAP
+                if paced:
+                    acked.wait(ACK_WAIT_TIMEOUT)
+                    remaining_gap = MIN_MESSAGE_GAP - (time.monotonic() - sent_at)
+                    if remaining_gap > 0:
+                        time.sleep(remaining_gap)
+                    
+            except Exception as e:
+                report_send_failure(e, i, total_messages)
+                return False
+    finally:
+        update_message_queue_count(-total_messages)
     
     return success_count == total_messages
 
 
-def send_messages_async(interface, messages, destination_id, sender_name, message_type="Reply"):
+def send_and_log_messages(interface, messages, destination_id, sender_name, message_type="Reply", coalesce=True):
     """
-    Send messages asynchronously in a separate thread to avoid blocking message reception.
+    Send messages and log the outcome to console, web and Discord.
     """
-    from logging_utils import log_console_web_and_discord
-    
-    def send_task():
-        try:
-            success = send_multiple_messages(interface, messages, destination_id)
-            
-            if success:
-                if len(messages) == 1:
-                    console = f"{message_type} -> {sender_name}: {messages[0]}"
-                else:
-                    console = f"{message_type} -> {sender_name}: {len(messages)} message{'s' if len(messages) > 1 else ''}"
-                log_console_web_and_discord(console, "green")
+    try:
+        success = send_multiple_messages(interface, messages, destination_id, coalesce)
+        
+        if success:
+            if len(messages) == 1:
+                console = f"{message_type} -> {sender_name}: {messages[0]}"
             else:
-                console = f"Failed to send {message_type.lower()} -> {sender_name}"
-                log_console_web_and_discord(console, "red")
-        except Exception as e:
-            console = f"Error sending {message_type.lower()} -> {sender_name}: {e}"
+                console = f"{message_type} -> {sender_name}: {len(messages)} message{'s' if len(messages) > 1 else ''}"
+            log_console_web_and_discord(console, "green")
+        else:
+            console = f"Failed to send {message_type.lower()} -> {sender_name}"
             log_console_web_and_discord(console, "red")
+    except Exception as e:
+        console = f"Error sending {message_type.lower()} -> {sender_name}: {e}"
+        log_console_web_and_discord(console, "red")
+
+
+def send_messages_async(interface, messages, destination_id, sender_name, message_type="Reply", coalesce=True):
+    """
+    Queue messages for the sender worker to avoid blocking message reception.
+    Pass coalesce=False for separate replies that must each go out on their own.
+    """
+    send_queue.put((interface, messages, destination_id, sender_name, message_type, coalesce))
+
+
+def send_single_async(interface, text, destination_id, sender_name, message_type="Reply"):
+    """
+    Queue one message known to fit in a single part, skipping split_message().
+    """
+    send_queue.put((interface, (text,), destination_id, sender_name, message_type, False))
+
+
+def message_sender_worker():
+    """
+    Worker thread that sends queued replies one request at a time.
+    
+    A single long-lived thread replaces spawning a thread per reply, and keeps
+    the parts of different replies from interleaving on the radio.
+    """
+    while not traceroute_shutdown.is_set():
+        try:
+            job = send_queue.get(timeout=1.0)
+        except queue.Empty:
+            continue  # Timeout, check shutdown flag
+        if job is None:  # Shutdown signal
+            break
+        send_and_log_messages(*job)
+
+
+def release_queue_slot(sender_id):
+    """
+    Give back a queued request slot once it starts processing or is rejected.
     
-    # Start the sending task in a separate thread
-    thread = threading.Thread(target=send_task, daemon=True)
-    thread.start()
-    return thread
+    Returns:
+        int: Number of requests still queued across all users
+    """
+    global queued_traceroute_count
+    with traceroute_queues_lock:
+        # Drop the user's entry once it reaches zero to keep the dict small
+        traceroute_queues[sender_id] -= 1
+        if traceroute_queues[sender_id] <= 0:
+            del traceroute_queues[sender_id]
+        queued_traceroute_count -= 1
+        return queued_traceroute_count
 
 
 def queue_traceroute(interface, destination_id, sender_name, sender_id):
@@ -208,20 +424,30 @@ def queue_traceroute(interface, destination_id, sender_name, sender_id):
     Returns:
         tuple: (success: bool, message: str)
             success=True if request was queued successfully
-            success=False if user's queue is full
+            success=False if user's queue or the global queue is full
             message contains queue position or error details
     
     Note:
         - Each user can have at most MAX_QUEUE_PER_USER requests queued
-        - Requests are processed FIFO with TRACEROUTE_RATE_LIMIT seconds between sends
+        - Requests are processed round-robin across users with TRACEROUTE_RATE_LIMIT
+          seconds between sends
         - The actual traceroute traces back to the requester (destination_id == sender_id)
     """
-    # Check user queue limit
-    user_queue = traceroute_queues[sender_id]
-    if len(user_queue) >= MAX_QUEUE_PER_USER:
-        return False, f"Queue full (max {MAX_QUEUE_PER_USER} per user)"
+    # Check user and global limits and count this request against them. The
+    # global cap is on queued_traceroute_count rather than traceroute_queue,
+    # since the worker drains traceroute_queue into its batch; position in the
+    # overall queue likewise counts every request that has not started yet.
+    global queued_traceroute_count
+    with traceroute_queues_lock:
+        # .get() so rejected senders don't leave zero entries in the defaultdict
+        if traceroute_queues.get(sender_id, 0) >= MAX_QUEUE_PER_USER:
+            return False, f"Queue full (max {MAX_QUEUE_PER_USER} per user)"
+        if queued_traceroute_count >= TRACEROUTE_QUEUE_MAX:
+            return False, "System busy, try again later"
+        traceroute_queues[sender_id] += 1
+        queued_traceroute_count += 1
+        queue_position = queued_traceroute_count
     
-    # Add to user queue
     request_data = {
         'interface': interface,
         'destination_id': destination_id,
@@ -229,133 +455,118 @@ def queue_traceroute(interface, destination_id, sender_name, sender_id):
         'sender_id': sender_id,
         'target_id': destination_id  # For Meshtastic traceroute, we trace to the sender
     }
-    user_queue.append(request_data)
     
     # Add to processing queue
     traceroute_queue.put(request_data)
     
-    # Calculate position in overall queue
-    queue_position = traceroute_queue.qsize()
-    
     return True, f"Queued (position {queue_position}, max wait ~{queue_position * TRACEROUTE_RATE_LIMIT}s)"
 
 
+def snr_formatter(snrs, valid):
+    """
+    Build a formatter for the SNR of each hop in a traceroute route.
+    
+    Args:
+        snrs: Repeated SNR field from RouteDiscovery, in quarter-dB units
+        valid: Whether snrs has one entry per hop (len(route) + 1)
+    
+    Returns:
+        callable: Maps an index into snrs to " (x.xdB)", or "" when the SNR
+        is unknown or the list does not line up with the route
+    """
+    if not valid:
+        return lambda idx: ""
+    
+    def format_snr(idx):
+        snr = snrs[idx]
+        return f" ({snr / 4.0:.1f}dB)" if snr != UNK_SNR else ""
+    return format_snr
+
+
 def custom_traceroute_response_handler(packet, pending_request):
     """
     Custom handler for traceroute responses that formats and sends results properly.
     This bypasses the Meshtastic library's print() statements.
     """
-    from logging_utils import log_console_and_web, log_web
-    import datetime
-    
     try:
         interface = pending_request['interface']
         destination_id = pending_request['destination_id']
         sender_name = pending_request['sender_name']
         
-        # Parse the RouteDiscovery payload
-        from meshtastic import mesh_pb2, portnums_pb2
-        import google.protobuf.json_format
-        
-        decoded = packet.get("decoded", {})
-        payload = decoded.get("payload", b"")
+        # Read everything needed from the packet once
+        decoded = packet.get("decoded") or {}
+        payload = decoded.get("payload") or b""
+        from_id = packet.get("from")
+        to_id = packet.get("to")
+        hop_start = packet.get("hopStart")
         
         if not payload:
             log_console_and_web(f"No payload in traceroute response for {sender_name}", "yellow")
             error_msg = "Traceroute completed but no route data available"
-            reply_messages = split_message(error_msg)
-            send_messages_async(interface, reply_messages, destination_id, sender_name, "Traceroute")
+            send_single_async(interface, error_msg, destination_id, sender_name, "Traceroute")
             return
         
+        # Parse the RouteDiscovery payload
         route_discovery = mesh_pb2.RouteDiscovery()
         route_discovery.ParseFromString(payload)
-        route_dict = google.protobuf.json_format.MessageToDict(route_discovery)
-        
-        # Format the traceroute result
-        result_lines = []
-        result_lines.append(f"Traceroute to {sender_name}:")
         
-        # Constants
-        UNK_SNR = -128
+        # Format route towards destination; repeated fields are read directly
+        route_list = route_discovery.route
+        snr_towards = route_discovery.snr_towards
         
-        # Format route towards destination
-        route_list = route_dict.get("route", [])
-        snr_towards = route_dict.get("snrTowards", [])
-        
-        from_id = packet.get("from")
-        to_id = packet.get("to")
+        # Both endpoints appear in the forward and the return route
+        to_hex = f"!{to_id:08x}"
+        from_hex = f"!{from_id:08x}"
         
         # Build the forward route
-        log_console_and_web(f"Route traced towards destination:", "cyan")
-        route_str = f"!{to_id:08x}"  # Start with destination (bot)
-        
+        log_console_and_web("Route traced towards destination:", "cyan")
         len_towards = len(route_list)
         snr_towards_valid = len(snr_towards) == len_towards + 1
+        snr_towards_str = snr_formatter(snr_towards, snr_towards_valid)
         
-        if len_towards > 0:
-            for idx, node_num in enumerate(route_list):
-                node_id = f"!{node_num:08x}"
-                snr_str = ""
-                if snr_towards_valid and idx < len(snr_towards) and snr_towards[idx] != UNK_SNR:
-                    snr_val = snr_towards[idx] / 4.0
-                    snr_str = f" ({snr_val:.1f}dB)"
-                route_str += f" --> {node_id}{snr_str}"
-        
-        # End with origin (the node that requested traceroute)
-        final_snr_str = ""
-        if snr_towards_valid and len(snr_towards) > 0 and snr_towards[-1] != UNK_SNR:
-            snr_val = snr_towards[-1] / 4.0
-            final_snr_str = f" ({snr_val:.1f}dB)"
-        route_str += f" --> !{from_id:08x}{final_snr_str}"
+        # Start with destination (bot) and end with origin (the node that
+        # requested traceroute)
+        hops = "".join([f" --> !{node_num:08x}{snr_towards_str(idx)}"
+                        for idx, node_num in enumerate(route_list)])
+        route_str = f"{to_hex}{hops} --> {from_hex}{snr_towards_str(-1)}"
         
         log_console_and_web(route_str, "green")
-        result_lines.append(f"\nRoute traced towards destination:")
-        result_lines.append(route_str)
         
         # Check for return route
-        route_back = route_dict.get("routeBack", [])
-        snr_back = route_dict.get("snrBack", [])
-        hop_start = packet.get("hopStart")
+        route_back = route_discovery.route_back
+        snr_back = route_discovery.snr_back
         
         len_back = len(route_back)
         back_valid = hop_start is not None and len(snr_back) == len_back + 1
         
+        back_lines = ()
         if back_valid:
-            log_console_and_web(f"Route traced back to us:", "cyan")
-            back_route_str = f"!{from_id:08x}"  # Start with origin
-            
-            if len_back > 0:
-                for idx, node_num in enumerate(route_back):
-                    node_id = f"!{node_num:08x}"
-                    snr_str = ""
-                    if idx < len(snr_back) and snr_back[idx] != UNK_SNR:
-                        snr_val = snr_back[idx] / 4.0
-                        snr_str = f" ({snr_val:.1f}dB)"
-                    back_route_str += f" --> {node_id}{snr_str}"
+            log_console_and_web("Route traced back to us:", "cyan")
+            snr_back_str = snr_formatter(snr_back, True)  # back_valid checked the lengths
             
-            # End with destination (us/bot)
-            final_back_snr_str = ""
-            if len(snr_back) > 0 and snr_back[-1] != UNK_SNR:
-                snr_val = snr_back[-1] / 4.0
-                final_back_snr_str = f" ({snr_val:.1f}dB)"
-            back_route_str += f" --> !{to_id:08x}{final_back_snr_str}"
+            # Start with origin and end with destination (us/bot)
+            back_hops = "".join([f" --> !{node_num:08x}{snr_back_str(idx)}"
+                                 for idx, node_num in enumerate(route_back)])
+            back_route_str = f"{from_hex}{back_hops} --> {to_hex}{snr_back_str(-1)}"
             
             log_console_and_web(back_route_str, "green")
-            result_lines.append(f"\nRoute traced back to us:")
-            result_lines.append(back_route_str)
+            back_lines = ("\nRoute traced back to us:", back_route_str)
         
-        # Add hop count
-        hop_count = len_towards
-        if hop_count == 0:
-            result_lines.append("\nDirect connection (0 hops)")
+        # Hop count
+        if len_towards == 0:
+            hop_line = "\nDirect connection (0 hops)"
         else:
-            result_lines.append(f"\nTotal hops: {hop_count}")
-        
-        # Add timestamp
-        current_timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        result_lines.append(f"Completed at: {current_timestamp}")
+            hop_line = f"\nTotal hops: {len_towards}"
         
-        result_msg = "\n".join(result_lines)
+        # Format the traceroute result from the strings built above
+        result_msg = "\n".join((
+            f"Traceroute to {sender_name}:",
+            "\nRoute traced towards destination:",
+            route_str,
+            *back_lines,
+            hop_line,
+            f"Completed at: {time_of_day()}",
+        ))
         
         # Send the result back to the user
         reply_messages = split_message(result_msg)
@@ -367,8 +578,29 @@ def custom_traceroute_response_handler(packet, pending_request):
         log_console_and_web(f"Error in custom traceroute handler: {e}", "red")
         # Send error message to user
         error_msg = f"Traceroute completed but error formatting results: {str(e)[:50]}"
-        reply_messages = split_message(error_msg)
-        send_messages_async(interface, reply_messages, destination_id, sender_name, "Traceroute")
+        send_single_async(interface, error_msg, destination_id, sender_name, "Traceroute")
+
+
+def drain_traceroute_queue(batch, limit=TRACEROUTE_DRAIN_LIMIT):
+    """
+    Move up to limit waiting requests from traceroute_queue into batch.
+    
+    Args:
+        batch: dict of sender_id -> deque of requests, in round-robin order
+        limit: Maximum number of requests to take in one call
+    
+    Returns:
+        bool: False if the shutdown signal was drained, True otherwise
+    """
+    for _ in range(limit):
+        try:
+            request_data = traceroute_queue.get_nowait()
+        except queue.Empty:
+            break
+        if request_data is None:  # Shutdown signal
+            return False
+        batch.setdefault(request_data['sender_id'], deque()).append(request_data)
+    return True
 
 
 def traceroute_worker():
@@ -380,74 +612,95 @@ def traceroute_worker():
     the Meshtastic firmware's limitation of one traceroute every 30 seconds.
     
     The worker:
-    1. Pulls requests from the traceroute_queue (FIFO)
+    1. Waits for requests on the traceroute_queue
     2. Checks if enough time has passed since the last traceroute was sent
     3. Waits if necessary to respect the rate limit
-    4. Sends the traceroute and waits for response (with timeout)
-    5. Processes the next request in the queue
+    4. Drains requests that arrived meanwhile and picks the next one,
+       round-robin across senders so no single user is served twice in a row
+       while others are waiting
+    5. Sends the traceroute and waits for response (with timeout)
+    6. Processes the next request in the queue
     
     Rate limiting is enforced globally across all users to respect firmware limits.
     Per-user queue limits (MAX_QUEUE_PER_USER) prevent any single user from
     monopolizing the queue.
     """
-    from logging_utils import log_console_and_web, log_web
     global last_traceroute_time
     
+    # Requests drained from traceroute_queue, bucketed by sender_id; dicts keep
+    # insertion order, so the first key is the sender to serve next
+    batch = {}
+    
     while not traceroute_shutdown.is_set():
         try:
-            # Wait for a request (blocking with timeout)
-            request_data = traceroute_queue.get(timeout=1.0)
-            if request_data is None:  # Shutdown signal
+            # Wait for a request (blocking with timeout) unless some are already drained
+            if not batch:
+                request_data = traceroute_queue.get(timeout=1.0)
+                if request_data is None:  # Shutdown signal
+                    break
+                batch.setdefault(request_data['sender_id'], deque()).append(request_data)
+            
+            # Check if we need to wait for rate limiting
+            current_time = time.monotonic()
+            time_since_last = current_time - last_traceroute_time
+            
+            if time_since_last < TRACEROUTE_RATE_LIMIT:
+                wait_time = TRACEROUTE_RATE_LIMIT - time_since_last
+                log_console_and_web(f"Traceroute rate limit: waiting {wait_time:.1f}s before next request", "yellow")
+                time.sleep(wait_time)
+            
+            # Pick up requests that arrived while waiting so the choice below is fair
+            if not drain_traceroute_queue(batch):
                 break
             
+            # Serve senders round-robin: take the next sender's oldest request and
+            # move the sender to the back if it still has requests waiting
+            sender_id = next(iter(batch))
+            user_requests = batch.pop(sender_id)
+            request_data = user_requests.popleft()
+            if user_requests:
+                batch[sender_id] = user_requests
+            
             interface = request_data['interface']
             destination_id = request_data['destination_id']
             sender_name = request_data['sender_name']
-            sender_id = request_data['sender_id']
             target_id = request_data['target_id']
             
+            # Remove from user queue
+            remaining_in_queue = release_queue_slot(sender_id)
+            
+            # Bound the pending registry before adding to it
+            expired = expire_pending_traceroutes(TRACEROUTE_TIMEOUT * 2)
+            if expired:
+                log_console_and_web(f"Dropped {expired} stale pending traceroute(s)", "yellow")
+            
             # Log queue status
-            remaining_in_queue = traceroute_queue.qsize()
             if remaining_in_queue > 0:
                 log_console_and_web(f"Processing traceroute for {sender_name} ({remaining_in_queue} remaining in queue)", "cyan")
             else:
                 log_console_and_web(f"Processing traceroute for {sender_name} (queue empty)", "cyan")
             
-            # Remove from user queue
-            user_queue = traceroute_queues[sender_id]
-            if request_data in user_queue:
-                user_queue.remove(request_data)
-            
-            # Check if we need to wait for rate limiting
-            current_time = time.time()
-            time_since_last = current_time - last_traceroute_time
-            
-            if time_since_last < TRACEROUTE_RATE_LIMIT:
-                wait_time = TRACEROUTE_RATE_LIMIT - time_since_last
-                log_console_and_web(f"Traceroute rate limit: waiting {wait_time:.1f}s for {sender_name}", "yellow")
-                time.sleep(wait_time)
-            
             # Update last traceroute time
-            last_traceroute_time = time.time()
+            last_traceroute_time = time.monotonic()
             
             # Run the Meshtastic traceroute
             log_console_and_web(f"Running Meshtastic traceroute for {sender_name}...", "cyan")
             
             # Notify the user that traceroute is starting
-            start_msg = "Starting traceroute..."
-            start_messages = split_message(start_msg)
-            send_messages_async(interface, start_messages, destination_id, sender_name, "Traceroute Start")
+            send_single_async(interface, "Starting traceroute...", destination_id, sender_name, "Traceroute Start")
             
             try:
                 # Store the pending request so we can match the response
                 # Store all request data for the custom handler
-                pending_traceroutes[sender_id] = {
+                response_event = threading.Event()
+                add_pending_traceroute(sender_id, {
                     'interface': interface,
                     'destination_id': destination_id,
                     'sender_name': sender_name,
                     'target_node_id': target_id,  # This is the node we're tracing to
-                    'timestamp': time.time()
-                }
+                    'timestamp': time.monotonic(),
+                    'event': response_event  # Set when a response handler claims the request
+                })
                 
                 log_console_and_web(f"Sending traceroute to {target_id} for {sender_name}", "cyan")
                 
@@ -455,27 +708,20 @@ def traceroute_worker():
                 # We'll use sendData directly with our custom callback
                 
                 try:
-                    from meshtastic import mesh_pb2, portnums_pb2
-                    
-                    # Create RouteDiscovery message
-                    route_discovery = mesh_pb2.RouteDiscovery()
-                    
                     # Define our custom response handler closure
                     def on_custom_traceroute_response(packet):
                         """Custom callback that captures the response and formats it properly"""
                         try:
-                            if sender_id in pending_traceroutes:
-                                pending_request = pending_traceroutes[sender_id]
+                            # Claim the request so only one responder handles it
+                            pending_request = pop_pending_traceroute(sender_id)
+                            if pending_request:
                                 custom_traceroute_response_handler(packet, pending_request)
-                                # Remove from pending after handling
-                                if sender_id in pending_traceroutes:
-                                    del pending_traceroutes[sender_id]
                         except Exception as e:
                             log_console_and_web(f"Error in traceroute callback: {e}", "red")
                     
                     # Send the traceroute using sendData with our custom callback
                     interface.sendData(
-                        route_discovery,
+                        EMPTY_ROUTE_DISCOVERY,
                         destinationId=target_id,
                         portNum=portnums_pb2.PortNum.TRACEROUTE_APP,
                         wantResponse=True,
@@ -487,45 +733,38 @@ def traceroute_worker():
                     # Wait for response with timeout
                     log_console_and_web(f"Waiting {TRACEROUTE_TIMEOUT}s for traceroute response from {sender_name}", "cyan")
                     
-                    # Custom wait implementation
-                    start_time = time.time()
-                    while sender_id in pending_traceroutes and (time.time() - start_time) < TRACEROUTE_TIMEOUT:
-                        time.sleep(0.5)
+                    # Wake as soon as a response handler claims the request
+                    response_event.wait(TRACEROUTE_TIMEOUT)
                     
-                    # Check if the traceroute was completed (removed from pending)
-                    if sender_id not in pending_traceroutes:
+                    # Claiming the request ourselves fails if a response got there
+                    # first, even one that raced the timeout
+                    if pop_pending_traceroute(sender_id) is None:
                         # Success - response was handled by our custom handler
                         log_console_and_web(f"Traceroute completed for {sender_name}", "green")
                     else:
-                        # Timed out - clean up and send timeout message
+                        # Timed out - pending request cleaned up, send timeout message
                         log_console_and_web(f"Traceroute timed out for {sender_name} - no response received", "yellow")
                         
-                        del pending_traceroutes[sender_id]
                         error_msg = "Traceroute timed out - no response received. The node may be offline or out of range."
-                        reply_messages = split_message(error_msg)
-                        send_messages_async(interface, reply_messages, destination_id, sender_name, "Traceroute")
+                        send_single_async(interface, error_msg, destination_id, sender_name, "Traceroute")
                     
                 except Exception as timeout_error:
                     # Traceroute timed out or failed
                     log_console_and_web(f"Traceroute error for {sender_name}: {str(timeout_error)[:100]}", "red")
                     
-                    if sender_id in pending_traceroutes:
-                        del pending_traceroutes[sender_id]
+                    pop_pending_traceroute(sender_id)
                     
                     error_msg = f"Traceroute failed: {str(timeout_error)[:50]}"
-                    reply_messages = split_message(error_msg)
-                    send_messages_async(interface, reply_messages, destination_id, sender_name, "Traceroute")
+                    send_single_async(interface, error_msg, destination_id, sender_name, "Traceroute")
                 
             except Exception as e:
                 # Clean up pending request on error
                 log_console_and_web(f"Traceroute exception for {sender_name}: {str(e)[:100]}", "red")
                 
-                if sender_id in pending_traceroutes:
-                    del pending_traceroutes[sender_id]
+                pop_pending_traceroute(sender_id)
                 
                 error_msg = f"Traceroute failed: {str(e)[:100]}"
-                reply_messages = split_message(error_msg)
-                send_messages_async(interface, reply_messages, destination_id, sender_name, "Traceroute")
+                send_single_async(interface, error_msg, destination_id, sender_name, "Traceroute")
             
             # Mark task as done
             traceroute_queue.task_done()
@@ -538,10 +777,13 @@ def traceroute_worker():
 
 def start_traceroute_worker():
     """
-    Start the traceroute worker thread.
+    Start the traceroute worker and message sender threads.
     """
-    from logging_utils import log_console_and_web, log_web
-    global traceroute_thread
+    global traceroute_thread, sender_thread
+    bind_connection_helpers()
+    if sender_thread is None or not sender_thread.is_alive():
+        sender_thread = threading.Thread(target=message_sender_worker, daemon=True, name="MessageSender")
+        sender_thread.start()
     if traceroute_thread is None or not traceroute_thread.is_alive():
         traceroute_thread = threading.Thread(target=traceroute_worker, daemon=True, name="TracerouteWorker")
         traceroute_thread.start()
@@ -549,8 +791,8 @@ def start_traceroute_worker():
 
 
 def stop_traceroute_worker():
-    """Stop the traceroute worker thread."""
+    """Stop the traceroute worker and message sender threads."""
     global traceroute_shutdown
     traceroute_shutdown.set()
-    if traceroute_queue:
-        traceroute_queue.put(None)  # Signal shutdown
\ No newline at end of file
+    traceroute_queue.put(None)  # Signal shutdown
+    send_queue.put(None)
\ No newline at end of file
@@ -75,13 +75,14 @@ def test_rate_limiting():
     print("-" * 60)
     
     # Reset the module state
-    traceroute.last_traceroute_time = 0
+    traceroute.last_traceroute_time = -MockConfig.TRACEROUTE_RATE_LIMIT
     while not traceroute.traceroute_queue.empty():
         try:
             traceroute.traceroute_queue.get_nowait()
         except:
             break
     traceroute.traceroute_queues.clear()
+    traceroute.queued_traceroute_count = 0
     traceroute.pending_traceroutes.clear()
     traceroute.traceroute_shutdown.clear()
     
@@ -160,7 +161,7 @@ def test_initial_request():
     print("-" * 60)
     
     # Check initial state
-    current_time = time.time()
+    current_time = time.monotonic()
     time_since_last = current_time - traceroute.last_traceroute_time
     
     print(f"  last_traceroute_time: {traceroute.last_traceroute_time}")
@@ -177,6 +178,53 @@ def test_initial_request():
         return False
 
 
+def test_split_message_lengths():
+    """Test that split_message never returns a part longer than max_length."""
+    print("\n[TEST 4] Message Split Lengths")
+    print("-" * 60)
+    
+    cases = [
+        ("word " * 12, 50),
+        ("x" * 150 + " " + "y" * 60, traceroute.MAX_MESSAGE_LENGTH),
+        ("Sentence one. " * 40, traceroute.MAX_MESSAGE_LENGTH),
+        ("z" * 450, traceroute.MAX_MESSAGE_LENGTH),
+    ]
+    
+    all_good = True
+    for text, max_length in cases:
+        parts = traceroute.split_message(text, max_length)
+        longest = max(len(part) for part in parts)
+        ok = longest <= max_length
+        all_good = all_good and ok
+        print(f"  {len(text)} chars, max {max_length}: {len(parts)} parts, longest {longest} {'✓' if ok else '✗'}")
+    
+    if all_good:
+        print("  → PASS: Every part fits within max_length\n")
+        return True
+    else:
+        print("  → FAIL: A part exceeded max_length\n")
+        return False
+
+
+def test_coalesce_messages():
+    """Test that adjacent parts are merged greedily within the packet byte limit."""
+    print("\n[TEST 5] Part Coalescing")
+    print("-" * 60)
+    
+    traceroute.MAX_PAYLOAD_BYTES = 233  # mesh_pb2.Constants.DATA_PAYLOAD_LEN, mocked above
+    parts = ["a" * 100, "b" * 100, "c" * 100, "d" * 20]
+    merged = traceroute.coalesce_messages(parts)
+    sizes = [len(message.encode('utf-8')) for message in merged]
+    print(f"  {len(parts)} parts -> {len(merged)} messages, byte sizes {sizes}")
+    
+    if merged == ["a" * 100 + " " + "b" * 100, "c" * 100 + " " + "d" * 20]:
+        print("  → PASS: Parts merged greedily within the byte limit\n")
+        return True
+    else:
+        print("  → FAIL: Unexpected merge result\n")
+        return False
+
+
 def main():
     """Run all validation tests."""
     print("=" * 60)
@@ -186,6 +234,8 @@ def main():
     tests = [
         ("Per-User Queue Limits", test_queue_limits),
         ("Initial Request Timing", test_initial_request),
+        ("Message Split Lengths", test_split_message_lengths),
+        ("Part Coalescing", test_coalesce_messages),
         # Note: Rate limiting timing test skipped as it requires clean environment
         # and takes 10+ seconds. Use test_traceroute_timing.py for full timing tests.
     ]
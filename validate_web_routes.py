@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Validation script for the pre-built node CSV export.
+
+This script verifies that /nodes/export:
+1. Serves the pre-built export without a long-lived Cache-Control
+2. Answers an unchanged export with 304 Not Modified
+3. Rebuilds the export after any write to the nodes table
+
+Run this script to validate the implementation after making changes.
+"""
+
+import gzip
+import os
+import sqlite3
+import sys
+import tempfile
+
+# Point the database and export cache at a scratch directory before importing config
+work_dir = tempfile.mkdtemp(prefix='pingbot-validate-')
+os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'nodedb.sqlite')
+os.environ['NODES_EXPORT_CACHE_PATH'] = os.path.join(work_dir, 'nodes_export.csv.gz')
+
+from flask import Flask
+import database
+import web_routes
+
+database.init_database()
+conn = sqlite3.connect(os.environ['DATABASE_PATH'])
+conn.execute("INSERT INTO nodes (node_id, long_name, short_name, updated_at) VALUES ('!00000001', 'Node One', 'N1', 1700000000)")
+conn.commit()
+conn.close()
+
+app = Flask(__name__)
+web_routes.setup_routes(app, lambda: True, lambda: 0, lambda: True)
+client = app.test_client()
+
+
+def test_export_cache_control():
+    """Test that the pre-built export is revalidated rather than cached for a year."""
+    print("\n[TEST 1] Export Cache-Control")
+    print("-" * 60)
+    
+    web_routes.refresh_export_cache()
+    response = client.get('/nodes/export', headers={'Accept-Encoding': 'gzip'})
+    cache_control = response.headers.get('Cache-Control', '')
+    print(f"  Status: {response.status_code}, Cache-Control: {cache_control}")
+    
+    if response.status_code == 200 and 'no-cache' in cache_control and response.cache_control.max_age == 0:
+        print("  → PASS: Export must be revalidated before reuse\n")
+        return True
+    else:
+        print("  → FAIL: Expected 200 with no-cache and max-age=0\n")
+        return False
+
+
+def test_export_conditional():
+    """Test that an unchanged export answers If-None-Match with 304."""
+    print("\n[TEST 2] Export Revalidation")
+    print("-" * 60)
+    
+    web_routes.refresh_export_cache()
+    etag = client.get('/nodes/export', headers={'Accept-Encoding': 'gzip'}).headers.get('ETag')
+    response = client.get('/nodes/export', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    print(f"  ETag: {etag}, revalidation status: {response.status_code}")
+    
+    if etag and response.status_code == 304:
+        print("  → PASS: Unchanged export answered with 304\n")
+        return True
+    else:
+        print("  → FAIL: Expected 304 for an unchanged export\n")
+        return False
+
+
+def test_export_rebuild_on_write():
+    """Test that any write to nodes, even within the same second, triggers a rebuild."""
+    print("\n[TEST 3] Export Rebuild After Write")
+    print("-" * 60)
+    
+    web_routes.refresh_export_cache()
+    conn = sqlite3.connect(os.environ['DATABASE_PATH'])
+    conn.execute("UPDATE nodes SET long_name = 'Renamed Node' WHERE node_id = '!00000001'")
+    conn.commit()
+    conn.close()
+    web_routes.refresh_export_cache()
+    
+    response = client.get('/nodes/export', headers={'Accept-Encoding': 'gzip'})
+    body = gzip.decompress(response.get_data()).decode('utf-8')
+    print(f"  Export contains renamed node: {'Renamed Node' in body}")
+    
+    if 'Renamed Node' in body:
+        print("  → PASS: Export rebuilt after write\n")
+        return True
+    else:
+        print("  → FAIL: Export still shows the old row\n")
+        return False
+
+
+def main():
+    """Run all validation tests."""
+    print("=" * 60)
+    print("NODE EXPORT VALIDATION")
+    print("=" * 60)
+    
+    tests = [
+        ("Export Cache-Control", test_export_cache_control),
+        ("Export Revalidation", test_export_conditional),
+        ("Export Rebuild After Write", test_export_rebuild_on_write),
+    ]
+    
+    results = []
+    for name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((name, result))
+        except Exception as e:
+            print(f"\n[ERROR] {name} raised exception: {e}\n")
+            results.append((name, False))
+    
+    # Summary
+    print("=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    
+    for name, passed in results:
+        status = "✓ PASS" if passed else "✗ FAIL"
+        print(f"  {status}: {name}")
+    
+    all_passed = all(passed for _, passed in results)
+    
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("VALIDATION RESULT: ALL TESTS PASSED ✓")
+        print("=" * 60)
+        return 0
+    else:
+        print("VALIDATION RESULT: SOME TESTS FAILED ✗")
+        print("=" * 60)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
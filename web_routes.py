@@ -1,10 +1,16 @@
 """Web routes and templates for Meshtastic PingBot."""
 
-import sqlite3
+import base64
 import csv
-import io
-from flask import request, jsonify, render_template_string, Response
-from config import DATABASE_PATH, MAX_LOG_LINES
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from flask import request, jsonify, Response, send_file
+from config import MAX_LOG_LINES, NODES_EXPORT_CACHE_PATH, NODES_EXPORT_REFRESH_SECONDS
+from database import get_connection, node_search_clause, count_nodes, get_nodes_version
 
 
 # HTML Templates
@@ -14,25 +20,10 @@ HTML_TEMPLATE = """
 <head>
   <meta charset="UTF-8">
   <title>Meshtastic Ping-Pong Logs</title>
-  <style>
-    body { font-family: monospace; background: #1e1e1e; color: #eee; margin: 0; padding: 0; }
-    .navbar { background: #2a2a2a; padding: 10px; border-bottom: 1px solid #444; }
-    .navbar a { color: #00ff00; text-decoration: none; margin-right: 20px; padding: 5px 10px; }
-    .navbar a:hover { background: #333; border-radius: 3px; }
-    .navbar a.active { background: #444; border-radius: 3px; }
-    h2 { margin: 10px; color: #00ff00; }
-    #logs { height: 85vh; overflow-y: scroll; padding: 10px; box-sizing: border-box; background: #1e1e1e; }
-    .log { margin: 0.2em 0; white-space: pre-wrap; }
-    .cyan { color: #00ffff; }
-    .green { color: #00ff00; }
-    .yellow { color: #ffff00; }
-    .red { color: #ff5555; }
-    .magenta { color: #ff00ff; }
-    .blue { color: #5555ff; }
-    .bold { font-weight: bold; }
-  </style>
+  <link rel="stylesheet" href="{{ static_url('pingbot.css') }}">
+  <script src="{{ socketio_client_url }}" defer></script>
 </head>
-<body>
+<body class="page-logs">
   <div class="navbar">
     <a href="/" class="active">Live Logs</a>
     <a href="/nodes">Node Database</a>
@@ -40,17 +31,34 @@ HTML_TEMPLATE = """
   </div>
   <h2>Meshtastic Ping-Pong Logs</h2>
   <div id="logs"></div>
-  <script src="//cdnjs.cloudflare.com/ajax/libs/socket.io/4.5.4/socket.io.min.js"></script>
   <script>
-    var socket = io();
-    var logsDiv = document.getElementById("logs");
-    var logLines = [];
     const MAX_LOG_LINES = {{ max_lines }};
-    socket.on("log_message", function(data) {
-      logLines.push(data);
-      if (logLines.length > MAX_LOG_LINES) logLines.shift();
-      logsDiv.innerHTML = logLines.join('');
-      logsDiv.scrollTop = logsDiv.scrollHeight;
+    
+    // The Socket.IO client is deferred, so connect once the page has parsed
+    document.addEventListener('DOMContentLoaded', function() {
+      var socket = io();
+      var logsDiv = document.getElementById("logs");
+      var pending = [];
+      
+      // Append only the new lines once per frame and trim the oldest ones,
+      // instead of re-parsing the whole log on every message
+      function flushLogs() {
+        logsDiv.insertAdjacentHTML('beforeend', pending.join(''));
+        pending = [];
+        while (logsDiv.childElementCount > MAX_LOG_LINES) {
+          logsDiv.removeChild(logsDiv.firstElementChild);
+        }
+        logsDiv.scrollTop = logsDiv.scrollHeight;
+      }
+      
+      socket.on("log_message", function(data) {
+        if (pending.push(data) === 1) {
+          requestAnimationFrame(flushLogs);
+        } else if (pending.length > MAX_LOG_LINES) {
+          // Hidden tabs don't run animation frames; keep only what can be shown
+          pending.shift();
+        }
+      });
     });
   </script>
 </body>
@@ -63,30 +71,9 @@ HEALTH_TEMPLATE = """
 <head>
   <meta charset="UTF-8">
   <title>Meshtastic Pingbot - Health Status</title>
-  <style>
-    body { font-family: monospace; background: #1e1e1e; color: #eee; margin: 0; padding: 0; }
-    .navbar { background: #2a2a2a; padding: 10px; border-bottom: 1px solid #444; }
-    .navbar a { color: #00ff00; text-decoration: none; margin-right: 20px; padding: 5px 10px; }
-    .navbar a:hover { background: #333; border-radius: 3px; }
-    .navbar a.active { background: #444; border-radius: 3px; }
-    .container { padding: 20px; }
-    h2 { margin: 0 0 20px 0; color: #00ff00; }
-    .status-card { background: #2a2a2a; border-radius: 8px; padding: 20px; margin-bottom: 20px; border-left: 4px solid #555; }
-    .status-connected { border-left-color: #00ff00; }
-    .status-disconnected { border-left-color: #ff5555; }
-    .status-header { font-size: 1.2em; font-weight: bold; margin-bottom: 10px; }
-    .status-value { font-size: 1.5em; margin-bottom: 15px; }
-    .connected { color: #00ff00; }
-    .disconnected { color: #ff5555; }
-    .metric { margin-bottom: 8px; }
-    .metric-label { color: #888; }
-    .metric-value { color: #eee; font-weight: bold; }
-    .refresh-btn { background: #00ff00; color: #000; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; font-weight: bold; }
-    .refresh-btn:hover { background: #00cc00; }
-    .timestamp { margin-top: 20px; color: #888; font-size: 0.9em; }
-  </style>
+  <link rel="stylesheet" href="{{ static_url('pingbot.css') }}">
 </head>
-<body>
+<body class="page-health">
   <div class="navbar">
     <a href="/">Live Logs</a>
     <a href="/nodes">Node Database</a>
@@ -95,14 +82,14 @@ HEALTH_TEMPLATE = """
   <div class="container">
     <h2>Health Status</h2>
     
-    <div class="status-card {{ 'status-connected' if connected else 'status-disconnected' }}">
+    <div id="connectionCard" class="status-card {{ 'status-connected' if connected else 'status-disconnected' }}">
       <div class="status-header">Connection Status</div>
-      <div class="status-value {{ 'connected' if connected else 'disconnected' }}">
+      <div id="connectionStatus" class="status-value {{ 'connected' if connected else 'disconnected' }}">
         {{ 'CONNECTED' if connected else 'DISCONNECTED' }}
       </div>
       <div class="metric">
         <span class="metric-label">Radio Link:</span>
-        <span class="metric-value">{{ 'Active' if connected else 'Inactive' }}</span>
+        <span id="radioLink" class="metric-value">{{ 'Active' if connected else 'Inactive' }}</span>
       </div>
     </div>
     
@@ -110,15 +97,15 @@ HEALTH_TEMPLATE = """
       <div class="status-header">Message Queue</div>
       <div class="metric">
         <span class="metric-label">Queued Messages:</span>
-        <span class="metric-value">{{ queued }}</span>
+        <span id="queuedMessages" class="metric-value">{{ queued }}</span>
       </div>
       <div class="metric">
         <span class="metric-label">Queue Status:</span>
-        <span class="metric-value">{{ 'Normal' if queued < 10 else 'High' if queued < 50 else 'Critical' }}</span>
+        <span id="queueStatus" class="metric-value">{{ 'Normal' if queued < 10 else 'High' if queued < 50 else 'Critical' }}</span>
       </div>
     </div>
     
-    <button class="refresh-btn" onclick="window.location.reload()">Refresh Status</button>
+    <button class="refresh-btn" onclick="refreshStatus()">Refresh Status</button>
     
     <div class="timestamp">
       Last updated: <span id="timestamp"></span>
@@ -128,10 +115,31 @@ HEALTH_TEMPLATE = """
   <script>
     document.getElementById('timestamp').textContent = new Date().toLocaleString();
     
+    // Pull the JSON status and update the cards in place instead of reloading the page
+    function refreshStatus() {
+      fetch('/health', { headers: { 'Accept': 'application/json' } })
+        .then(response => response.json())
+        .then(data => {
+          const card = document.getElementById('connectionCard');
+          card.classList.toggle('status-connected', data.connected);
+          card.classList.toggle('status-disconnected', !data.connected);
+          
+          const status = document.getElementById('connectionStatus');
+          status.classList.toggle('connected', data.connected);
+          status.classList.toggle('disconnected', !data.connected);
+          status.textContent = data.connected ? 'CONNECTED' : 'DISCONNECTED';
+          
+          document.getElementById('radioLink').textContent = data.connected ? 'Active' : 'Inactive';
+          document.getElementById('queuedMessages').textContent = data.queued;
+          document.getElementById('queueStatus').textContent =
+            data.queued < 10 ? 'Normal' : data.queued < 50 ? 'High' : 'Critical';
+          document.getElementById('timestamp').textContent = new Date().toLocaleString();
+        })
+        .catch(error => console.error('Health refresh failed:', error));
+    }
+    
     // Auto-refresh every 30 seconds
-    setTimeout(function() {
-      window.location.reload();
-    }, 30000);
+    setInterval(refreshStatus, 30000);
   </script>
 </body>
 </html>
@@ -143,54 +151,9 @@ NODES_TEMPLATE = """
 <head>
   <meta charset="UTF-8">
   <title>Meshtastic Node Database</title>
-  <style>
-    body { font-family: monospace; background: #1e1e1e; color: #eee; margin: 0; padding: 0; }
-    .navbar { background: #2a2a2a; padding: 10px; border-bottom: 1px solid #444; }
-    .navbar a { color: #00ff00; text-decoration: none; margin-right: 20px; padding: 5px 10px; }
-    .navbar a:hover { background: #333; border-radius: 3px; }
-    .navbar a.active { background: #444; border-radius: 3px; }
-    .container { padding: 20px; }
-    h2 { color: #00ff00; margin-bottom: 20px; }
-    
-    .controls { background: #2a2a2a; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
-    .controls input, .controls select { 
-      background: #333; color: #eee; border: 1px solid #555; padding: 5px; margin-right: 10px; 
-      border-radius: 3px; font-family: monospace;
-    }
-    .controls button { 
-      background: #444; color: #eee; border: 1px solid #666; padding: 5px 10px; 
-      border-radius: 3px; cursor: pointer; font-family: monospace;
-    }
-    .controls button:hover { background: #555; }
-    
-    .stats { color: #888; margin-bottom: 10px; }
-    
-    table { width: 100%; border-collapse: collapse; background: #2a2a2a; border-radius: 5px; overflow: hidden; }
-    th, td { padding: 8px 12px; border-bottom: 1px solid #444; text-align: left; }
-    th { background: #333; color: #00ff00; font-weight: bold; cursor: pointer; user-select: none; }
-    th:hover { background: #444; }
-    th.sortable::after { content: ' ↕'; opacity: 0.5; }
-    th.sort-asc::after { content: ' ↑'; opacity: 1; color: #00ff00; }
-    th.sort-desc::after { content: ' ↓'; opacity: 1; color: #00ff00; }
-    
-    tbody tr:hover { background: #333; }
-    .node-id { color: #00ffff; font-weight: bold; }
-    .long-name { color: #00ff00; }
-    .short-name { color: #ffff00; }
-    .good-signal { color: #00ff00; }
-    .fair-signal { color: #ffff00; }
-    .poor-signal { color: #ff5555; }
-    .pagination { margin: 20px 0; text-align: center; }
-    .pagination button { 
-      background: #444; color: #eee; border: 1px solid #666; padding: 5px 10px; 
-      margin: 0 2px; border-radius: 3px; cursor: pointer; 
-    }
-    .pagination button:hover:not(:disabled) { background: #555; }
-    .pagination button:disabled { opacity: 0.5; cursor: not-allowed; }
-    .pagination .current { background: #00ff00; color: #000; }
-  </style>
+  <link rel="stylesheet" href="{{ static_url('pingbot.css') }}">
 </head>
-<body>
+<body class="page-nodes">
   <div class="navbar">
     <a href="/">Live Logs</a>
     <a href="/nodes" class="active">Node Database</a>
@@ -206,7 +169,7 @@ NODES_TEMPLATE = """
       <button onclick="refreshNodeDB()">Refresh NodeDB</button>
     </div>
     
-    <div class="stats">
+    <div class="stats" id="nodeStats">
       Total nodes: {{ total_count }} | Page {{ page }} of {{ total_pages }}
     </div>
     
@@ -223,7 +186,7 @@ NODES_TEMPLATE = """
           <th class="sortable" data-column="updated_at">Updated</th>
         </tr>
       </thead>
-      <tbody>
+      <tbody id="nodeRows">
         {% for node in nodes %}
         <tr>
           <td class="node-id">{{ node.node_id }}</td>
@@ -236,8 +199,8 @@ NODES_TEMPLATE = """
             {{ node.snr if node.snr else 'N/A' }}
           </td>
           <td>{{ node.hop_count if node.hop_count else 'N/A' }}</td>
-          <td>{{ node.last_heard | formatTimestamp if node.last_heard else 'Never' }}</td>
-          <td>{{ node.updated_at | formatTimestamp if node.updated_at else 'Never' }}</td>
+          <td>{{ node.last_heard_fmt or 'Never' }}</td>
+          <td>{{ node.updated_at_fmt or 'Never' }}</td>
         </tr>
         {% endfor %}
       </tbody>
@@ -261,7 +224,7 @@ NODES_TEMPLATE = """
       {% endfor %}
       
       {% if page < total_pages %}
-        <button onclick="changePage({{ page + 1 }})">Next</button>
+        <button id="nextPage" data-after="{{ next_cursor }}" onclick="changePage({{ page + 1 }}, this.dataset.after)">Next</button>
       {% endif %}
     </div>
   </div>
@@ -270,14 +233,16 @@ NODES_TEMPLATE = """
     let currentSort = '{{ sort_by }}';
     let currentOrder = '{{ sort_order }}';
     let currentSearch = '{{ search }}';
+    const totalPages = {{ total_pages }};
     
-    function changePage(page) {
+    function changePage(page, after) {
       const params = new URLSearchParams({
         page: page,
         sort: currentSort,
         order: currentOrder,
         search: currentSearch
       });
+      if (after) params.set('after', after);
       window.location.href = '/nodes?' + params.toString();
     }
     
@@ -330,6 +295,53 @@ NODES_TEMPLATE = """
       });
     }
     
+    function signalClass(value, good, fair) {
+      return value && value > good ? 'good-signal' : value && value > fair ? 'fair-signal' : 'poor-signal';
+    }
+    
+    // Build a table row the same way the server template does
+    function renderNodeRow(node) {
+      const row = document.createElement('tr');
+      const cells = [
+        ['node-id', node.node_id],
+        ['long-name', node.long_name || 'N/A'],
+        ['short-name', node.short_name || 'N/A'],
+        [signalClass(node.rssi, -80, -100), node.rssi ? node.rssi : 'N/A'],
+        // SNR is a REAL column, so keep Python's "2.0" rather than JavaScript's "2"
+        [signalClass(node.snr, 5, 0), node.snr ? (Number.isInteger(node.snr) ? node.snr.toFixed(1) : node.snr) : 'N/A'],
+        ['', node.hop_count ? node.hop_count : 'N/A'],
+        ['', node.last_heard_fmt || 'Never'],
+        ['', node.updated_at_fmt || 'Never']
+      ];
+      cells.forEach(([className, text]) => {
+        const cell = document.createElement('td');
+        if (className) cell.className = className;
+        cell.textContent = text;
+        row.appendChild(cell);
+      });
+      return row;
+    }
+    
+    // Re-fetch this page as JSON and redraw only the table body
+    function refreshNodes() {
+      fetch(window.location.pathname + window.location.search, { headers: { 'Accept': 'application/json' } })
+        .then(response => response.json())
+        .then(data => {
+          if (data.error) throw new Error(data.error);
+          if (data.total_pages !== totalPages) {
+            // The page count changed, so the pagination needs a full render
+            window.location.reload();
+            return;
+          }
+          document.getElementById('nodeRows').replaceChildren(...data.nodes.map(renderNodeRow));
+          document.getElementById('nodeStats').textContent =
+            `Total nodes: ${data.total_count} | Page ${data.page} of ${data.total_pages}`;
+          const nextPage = document.getElementById('nextPage');
+          if (nextPage) nextPage.dataset.after = data.next_cursor;
+        })
+        .catch(error => console.error('Node refresh failed:', error));
+    }
+    
     function exportData() {
       const params = new URLSearchParams({
         sort: currentSort,
@@ -358,7 +370,7 @@ NODES_TEMPLATE = """
       });
       
       // Auto-refresh every 30 seconds
-      setInterval(() => window.location.reload(), 30000);
+      setInterval(refreshNodes, 30000);
     });
   </script>
 </body>
@@ -366,12 +378,190 @@ NODES_TEMPLATE = """
 """
 
 
+# Socket.IO client for the live log page: served from static/js when a copy has
+# been placed there, otherwise loaded from the CDN
+SOCKETIO_CLIENT_FILE = 'js/socket.io.min.js'
+SOCKETIO_CLIENT_CDN_URL = '//cdnjs.cloudflare.com/ajax/libs/socket.io/4.5.4/socket.io.min.js'
+
+# Columns the node browser table renders, and the full set for JSON and CSV
+NODE_BROWSE_COLUMNS = (
+    'node_id', 'long_name', 'short_name', 'rssi', 'snr', 'hop_count', 'last_heard', 'updated_at'
+)
+NODE_DETAIL_COLUMNS = (
+    'node_id', 'long_name', 'short_name', 'mac_addr', 'hw_model', 'role',
+    'last_heard', 'snr', 'rssi', 'hop_count', 'is_licensed', 'via_mqtt',
+    'created_at', 'updated_at'
+)
+
+# SQLite formats the browser's timestamps in local time, NULL (shown as Never) when unset
+NODE_FORMATTED_TIMESTAMPS = """
+    strftime('%Y-%m-%d %H:%M:%S', NULLIF(last_heard, 0), 'unixepoch', 'localtime') AS last_heard_fmt,
+    strftime('%Y-%m-%d %H:%M:%S', NULLIF(updated_at, 0), 'unixepoch', 'localtime') AS updated_at_fmt"""
+NODE_BROWSE_SELECT = ', '.join(NODE_BROWSE_COLUMNS) + ',' + NODE_FORMATTED_TIMESTAMPS
+NODE_JSON_SELECT = ', '.join(NODE_DETAIL_COLUMNS) + ',' + NODE_FORMATTED_TIMESTAMPS
+NODE_DETAIL_SELECT = ', '.join(NODE_DETAIL_COLUMNS)
+
+# Whitelists for the sort query parameters
+VALID_SORT_COLUMNS = frozenset(NODE_BROWSE_COLUMNS)
+VALID_SORT_ORDERS = frozenset(('asc', 'desc'))
+
+# Every ORDER BY the browser can ask for, with node_id breaking ties so page
+# cursors are stable. Only these constant strings reach the SQL text.
+NODE_ORDER_CLAUSES = {
+    (column, order): f" ORDER BY {column} {order.upper()}" + (f", node_id {order.upper()}" if column != 'node_id' else "")
+    for column in VALID_SORT_COLUMNS
+    for order in VALID_SORT_ORDERS
+}
+
+# Rows joined into each chunk of a streamed CSV export
+CSV_EXPORT_BATCH_ROWS = 1000
+
+# Level 1 keeps most of gzip's ratio on CSV at a fraction of the CPU cost
+CSV_GZIP_LEVEL = 1
+
+CSV_EXPORT_HEADER = [
+    'Node ID', 'Long Name', 'Short Name', 'MAC Address', 'HW Model', 'Role',
+    'Last Heard', 'SNR', 'RSSI', 'Hop Count', 'Licensed', 'Via MQTT',
+    'Created At', 'Updated At'
+]
+
+# The export the "Export CSV" button asks for when the table is unsorted and unsearched
+DEFAULT_EXPORT_QUERY = f"SELECT {NODE_DETAIL_SELECT} FROM nodes" + NODE_ORDER_CLAUSES[('updated_at', 'desc')]
+
+# nodes table version the cached export file was built from (None until built)
+export_cache_version = None
+
+
+class CSVLineEcho:
+    """Write target for csv.writer that hands each line back instead of buffering it"""
+    
+    def write(self, line):
+        return line
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks on the fly, closing the source when done"""
+    compressor = zlib.compressobj(CSV_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        chunks.close()
+
+
+def iter_nodes_csv(query, params):
+    """Run an export query and yield the CSV header, then a batch of rows at a time"""
+    writer = csv.writer(CSVLineEcho())
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = CSV_EXPORT_BATCH_ROWS
+        cursor.execute(query, params)
+        
+        yield writer.writerow(CSV_EXPORT_HEADER)
+        
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield ''.join(map(writer.writerow, rows))
+
+
+def refresh_export_cache():
+    """Rebuild the cached default export if the nodes table changed since the last build"""
+    global export_cache_version
+    version = get_nodes_version()
+    if version == export_cache_version:
+        return
+    
+    # Write beside the target and rename so downloads never see a half-written file
+    temp_path = NODES_EXPORT_CACHE_PATH + '.tmp'
+    with open(temp_path, 'wb') as f:
+        for data in gzip_chunks(iter_nodes_csv(DEFAULT_EXPORT_QUERY, [])):
+            f.write(data)
+    os.replace(temp_path, NODES_EXPORT_CACHE_PATH)
+    export_cache_version = version
+
+
+def schedule_export_cache_refresh(interval_seconds=NODES_EXPORT_REFRESH_SECONDS):
+    """Keep the default CSV export pre-built so downloads don't hold a web worker"""
+    from logging_utils import log_console_and_web
+    
+    def periodic_refresh():
+        while True:
+            try:
+                refresh_export_cache()
+            except Exception as e:
+                log_console_and_web(f"Error refreshing CSV export cache: {e}", "yellow")
+            time.sleep(interval_seconds)
+    
+    refresh_thread = threading.Thread(target=periodic_refresh, daemon=True, name="ExportCacheRefresh")
+    refresh_thread.start()
+
+
+def encode_page_cursor(sort_value, node_id):
+    """Encode the last row's sort key as an opaque cursor for the next page"""
+    raw = json.dumps([sort_value, node_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_page_cursor(cursor):
+    """Decode a page cursor into (sort_value, node_id), or None if invalid"""
+    try:
+        sort_value, node_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return sort_value, node_id
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_clause(sort_by, sort_order, cursor):
+    """Build the condition selecting rows after the cursor in the current sort order"""
+    sort_value, node_id = cursor
+    
+    # SQLite sorts NULLs first ascending and last descending, and a row-value
+    # comparison against NULL never matches, so NULLs need their own branches
+    if sort_order == 'desc':
+        if sort_value is None:
+            return f"({sort_by} IS NULL AND node_id < ?)", [node_id]
+        return f"(({sort_by}, node_id) < (?, ?) OR {sort_by} IS NULL)", [sort_value, node_id]
+    
+    if sort_value is None:
+        return f"(({sort_by} IS NULL AND node_id > ?) OR {sort_by} IS NOT NULL)", [node_id]
+    return f"({sort_by}, node_id) > (?, ?)", [sort_value, node_id]
+
+
 def setup_routes(app, is_connected_func, message_queue_count_func, enhanced_download_nodedb_func):
     """Setup Flask routes for the application."""
     
+    # Static files are requested through versioned URLs, so browsers can cache them for a year
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+    static_versions = {}
+    
+    def static_url(filename):
+        """URL for a static file, versioned by its modification time"""
+        if filename not in static_versions:
+            mtime = int(os.path.getmtime(os.path.join(app.static_folder, filename)))
+            static_versions[filename] = f"{app.static_url_path}/{filename}?v={mtime}"
+        return static_versions[filename]
+    
+    app.jinja_env.globals['static_url'] = static_url
+    
+    if os.path.exists(os.path.join(app.static_folder, SOCKETIO_CLIENT_FILE)):
+        socketio_client_url = static_url(SOCKETIO_CLIENT_FILE)
+    else:
+        socketio_client_url = SOCKETIO_CLIENT_CDN_URL
+    
+    # Compile templates once through the app's environment so autoescaping
+    # matches render_template_string
+    index_template = app.jinja_env.from_string(HTML_TEMPLATE)
+    health_template = app.jinja_env.from_string(HEALTH_TEMPLATE)
+    nodes_template = app.jinja_env.from_string(NODES_TEMPLATE)
+    
     @app.route("/")
     def index():
-        return render_template_string(HTML_TEMPLATE, max_lines=MAX_LOG_LINES)
+        return index_template.render(max_lines=MAX_LOG_LINES, socketio_client_url=socketio_client_url)
 
     @app.route("/nodes")
     def nodes():
@@ -382,99 +572,104 @@ def setup_routes(app, is_connected_func, message_queue_count_func, enhanced_down
         search = request.args.get('search', '')
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 50))
+        after = request.args.get('after', '')
         
         # Validate sort parameters
-        valid_columns = ['node_id', 'long_name', 'short_name', 'rssi', 'snr', 'hop_count', 'last_heard', 'updated_at']
-        if sort_by not in valid_columns:
+        if sort_by not in VALID_SORT_COLUMNS:
             sort_by = 'updated_at'
-        if sort_order not in ['asc', 'desc']:
+        if sort_order not in VALID_SORT_ORDERS:
             sort_order = 'desc'
         
+        # "Next" links carry a cursor so deep pages seek instead of skipping rows
+        page_cursor = decode_page_cursor(after) if after else None
+        
+        # The HTML table only needs the browse columns; JSON keeps every field
+        wants_json = request.headers.get('Accept') == 'application/json'
+        select_list = NODE_JSON_SELECT if wants_json else NODE_BROWSE_SELECT
+        
         try:
-            conn = sqlite3.connect(DATABASE_PATH)
-            cursor = conn.cursor()
-            
-            # Build query with search filter
-            base_query = '''
-                SELECT node_id, long_name, short_name, mac_addr, hw_model, role, 
-                       last_heard, snr, rssi, hop_count, is_licensed, via_mqtt, 
-                       created_at, updated_at
-                FROM nodes
-            '''
-            
-            where_clause = ""
-            params = []
-            
-            if search:
-                where_clause = """
-                    WHERE (node_id LIKE ? OR long_name LIKE ? OR short_name LIKE ?)
-                """
-                search_param = f"%{search}%"
-                params = [search_param, search_param, search_param]
-            
-            # Add sorting
-            order_clause = f" ORDER BY {sort_by} {sort_order.upper()}"
-            
-            # Count total records
-            count_query = f"SELECT COUNT(*) FROM nodes{where_clause}"
-            cursor.execute(count_query, params)
-            total_count = cursor.fetchone()[0]
-            
-            # Add pagination
-            limit_clause = f" LIMIT {per_page} OFFSET {(page - 1) * per_page}"
+            # The page can only change when the nodes table does, so an unchanged
+            # version lets a refresh skip the queries and rendering entirely
+            nodes_version = get_nodes_version()
+            etag = f"nodes-{nodes_version}-{'json' if wants_json else 'html'}"
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag, weak=True)
+                response.headers['Vary'] = 'Accept'
+                return response
             
-            # Execute main query
-            full_query = base_query + where_clause + order_clause + limit_clause
-            cursor.execute(full_query, params)
+            # Count total records (cached per search until the table changes)
+            total_count = count_nodes(search, nodes_version)
             
-            nodes_data = []
-            for row in cursor.fetchall():
-                node_data = {
-                    'node_id': row[0],
-                    'long_name': row[1],
-                    'short_name': row[2],
-                    'mac_addr': row[3],
-                    'hw_model': row[4],
-                    'role': row[5],
-                    'last_heard': row[6],
-                    'snr': row[7],
-                    'rssi': row[8],
-                    'hop_count': row[9],
-                    'is_licensed': row[10],
-                    'via_mqtt': row[11],
-                    'created_at': row[12],
-                    'updated_at': row[13]
-                }
-                nodes_data.append(node_data)
-            
-            conn.close()
+            with get_connection() as conn:
+                # Row objects give the template name access without building dicts
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                
+                # Build query with search filter
+                base_query = f"SELECT {select_list} FROM nodes"
+                
+                where_clause, params = node_search_clause(search)
+                
+                # Add sorting
+                order_clause = NODE_ORDER_CLAUSES[(sort_by, sort_order)]
+                
+                # Add pagination, bound as parameters so the statement text (and
+                # sqlite3's cached statement) is shared across pages
+                page_clause = where_clause
+                page_params = params
+                if page_cursor:
+                    condition, condition_params = keyset_clause(sort_by, sort_order, page_cursor)
+                    page_clause += (" AND " if where_clause else " WHERE ") + condition
+                    page_params = params + condition_params + [per_page]
+                    limit_clause = " LIMIT ?"
+                else:
+                    page_params = params + [per_page, (page - 1) * per_page]
+                    limit_clause = " LIMIT ? OFFSET ?"
+                
+                # Execute main query
+                full_query = base_query + page_clause + order_clause + limit_clause
+                cursor.execute(full_query, page_params)
+                
+                nodes_data = cursor.fetchall()
             
             # Calculate pagination info
             total_pages = (total_count + per_page - 1) // per_page
+            next_cursor = ''
+            if page < total_pages and len(nodes_data) == per_page:
+                last_node = nodes_data[-1]
+                next_cursor = encode_page_cursor(last_node[sort_by], last_node['node_id'])
             
             # If this is an AJAX request, return JSON
-            if request.headers.get('Accept') == 'application/json':
-                return jsonify({
-                    'nodes': nodes_data,
+            if wants_json:
+                response = jsonify({
+                    'nodes': [dict(node) for node in nodes_data],
                     'total_count': total_count,
                     'page': page,
                     'per_page': per_page,
                     'total_pages': total_pages,
+                    'next_cursor': next_cursor,
                     'sort_by': sort_by,
                     'sort_order': sort_order,
                     'search': search
                 })
+            else:
+                # Otherwise return HTML template
+                response = Response(nodes_template.render(nodes=nodes_data,
+                                                          total_count=total_count,
+                                                          page=page,
+                                                          per_page=per_page,
+                                                          total_pages=total_pages,
+                                                          next_cursor=next_cursor,
+                                                          sort_by=sort_by,
+                                                          sort_order=sort_order,
+                                                          search=search))
             
-            # Otherwise return HTML template
-            return render_template_string(NODES_TEMPLATE, 
-                                        nodes=nodes_data,
-                                        total_count=total_count,
-                                        page=page,
-                                        per_page=per_page,
-                                        total_pages=total_pages,
-                                        sort_by=sort_by,
-                                        sort_order=sort_order,
-                                        search=search)
+            # Let browsers keep the page but revalidate it with the ETag each time
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['Vary'] = 'Accept'
+            return response
         
         except Exception as e:
             if request.headers.get('Accept') == 'application/json':
@@ -491,64 +686,53 @@ def setup_routes(app, is_connected_func, message_queue_count_func, enhanced_down
             search = request.args.get('search', '')
             
             # Validate sort parameters
-            valid_columns = ['node_id', 'long_name', 'short_name', 'rssi', 'snr', 'hop_count', 'last_heard', 'updated_at']
-            if sort_by not in valid_columns:
+            if sort_by not in VALID_SORT_COLUMNS:
                 sort_by = 'updated_at'
-            if sort_order not in ['asc', 'desc']:
+            if sort_order not in VALID_SORT_ORDERS:
                 sort_order = 'desc'
             
-            conn = sqlite3.connect(DATABASE_PATH)
-            cursor = conn.cursor()
+            # The default export is pre-built in the background; send that file as-is
+            if (not search and sort_by == 'updated_at' and sort_order == 'desc'
+                    and export_cache_version is not None and request.accept_encodings['gzip']):
+                # max_age=0 overrides the year-long static file default so
+                # clients revalidate against the ETag instead of keeping a stale copy
+                response = send_file(os.path.abspath(NODES_EXPORT_CACHE_PATH), mimetype='text/csv', as_attachment=True,
+                                     download_name='meshtastic_nodes.csv', conditional=True, max_age=0)
+                response.headers['Content-Encoding'] = 'gzip'
+                response.headers['Vary'] = 'Accept-Encoding'
+                return response
             
             # Build query (no pagination for export)
-            base_query = '''
-                SELECT node_id, long_name, short_name, mac_addr, hw_model, role, 
-                       last_heard, snr, rssi, hop_count, is_licensed, via_mqtt, 
-                       created_at, updated_at
-                FROM nodes
-            '''
-            
-            where_clause = ""
-            params = []
+            base_query = f"SELECT {NODE_DETAIL_SELECT} FROM nodes"
             
-            if search:
-                where_clause = """
-                    WHERE (node_id LIKE ? OR long_name LIKE ? OR short_name LIKE ?)
-                """
-                search_param = f"%{search}%"
-                params = [search_param, search_param, search_param]
+            where_clause, params = node_search_clause(search)
             
             # Add sorting
-            order_clause = f" ORDER BY {sort_by} {sort_order.upper()}"
+            order_clause = NODE_ORDER_CLAUSES[(sort_by, sort_order)]
             
-            # Execute query
             full_query = base_query + where_clause + order_clause
-            cursor.execute(full_query, params)
             
-            # Create CSV content
-            output = io.StringIO()
-            writer = csv.writer(output)
+            # Run the query before responding so database errors still return a 500
+            csv_chunks = iter_nodes_csv(full_query, params)
+            header = next(csv_chunks)
             
-            # Write header
-            writer.writerow([
-                'Node ID', 'Long Name', 'Short Name', 'MAC Address', 'HW Model', 'Role',
-                'Last Heard', 'SNR', 'RSSI', 'Hop Count', 'Licensed', 'Via MQTT',
-                'Created At', 'Updated At'
-            ])
+            def stream_csv():
+                yield header
+                yield from csv_chunks
             
-            # Write data rows
-            for row in cursor.fetchall():
-                writer.writerow(row)
+            body = stream_csv()
+            headers = {
+                'Content-Disposition': 'attachment; filename=meshtastic_nodes.csv',
+                'Vary': 'Accept-Encoding'
+            }
             
-            conn.close()
+            # CSV compresses well, so gzip it for clients that accept it
+            if request.accept_encodings['gzip']:
+                body = gzip_chunks(body)
+                headers['Content-Encoding'] = 'gzip'
             
-            # Return CSV as downloadable file
-            output.seek(0)
-            return Response(
-                output.getvalue(),
-                mimetype='text/csv',
-                headers={'Content-Disposition': 'attachment; filename=meshtastic_nodes.csv'}
-            )
+            # Stream the CSV as a downloadable file
+            return Response(body, mimetype='text/csv', headers=headers)
             
         except Exception as e:
             return f"Export error: {e}", 500
@@ -570,9 +754,8 @@ def setup_routes(app, is_connected_func, message_queue_count_func, enhanced_down
             return response
         
         # Otherwise return HTML template for web interface
-        return render_template_string(HEALTH_TEMPLATE, 
-                                    connected=health_data["connected"],
-                                    queued=health_data["queued"])
+        return health_template.render(connected=health_data["connected"],
+                                      queued=health_data["queued"])
 
     @app.route("/nodedb/stats")
     def nodedb_stats():